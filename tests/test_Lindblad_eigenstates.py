@@ -0,0 +1,88 @@
+import numpy as np
+from scipy.sparse import issparse
+
+from ufss.vibronic_eigenstates.Lindblad_eigenstates import Polymer, OpenPolymer
+
+def make_manifold_structures(num_sites):
+    """Sets up only the manifold index structures of a Polymer, which do 
+        not depend on the site energies or couplings
+"""
+    p = Polymer.__new__(Polymer)
+    p.num_sites = num_sites
+    p.N = 2
+    p.set_site_occupation_numbers()
+    p.set_electronic_total_occupation_number()
+    return p
+
+def test_manifold_coherences_with_many_sites():
+    # With 11 sites the manifold pairs (1,10) and (11,0) must not be confused
+    p = make_manifold_structures(11)
+    O = np.zeros((2**11,2**11))
+    assert p.extract_coherence(O,1,10).shape == (11,11)
+    assert p.extract_coherence(O,11,0).shape == (1,1)
+    assert p.extract_coherence(O,1,11).shape == (11,1)
+    assert p.extract_coherence(O,11,1).shape == (1,11)
+
+def test_coherence_to_full_round_trip():
+    p = make_manifold_structures(11)
+    p.electronic_hamiltonian = np.zeros((2**11,2**11))
+    O = np.arange(11*11,dtype=float).reshape(11,11)
+    Ofull = p.coherence_to_full(O,1,10)
+    assert np.array_equal(p.extract_coherence(Ofull,1,10),O)
+    assert np.count_nonzero(Ofull) == np.count_nonzero(O)
+
+def make_dimer():
+    return OpenPolymer([1.0,1.2],[0.2],np.array([[1.,0,0],[0,1.,0]]))
+
+def make_dimer_instructions(dimer):
+    """Commutator, dense Lindblad and sparse transition instructions, so that
+        shared identities of both kinds appear
+"""
+    rng = np.random.default_rng(0)
+    O = rng.standard_normal((4,4)) + 1j*rng.standard_normal((4,4))
+    ins = dimer.make_commutator_instructions(-1j*dimer.electronic_hamiltonian)
+    ins += dimer.make_Lindblad_instructions(0.1,O)
+    ins += dimer.make_transition_Lindblad_instructions(0.05,0,1,4)
+    return ins
+
+def dense(O):
+    if issparse(O):
+        return O.toarray()
+    return np.asarray(O)
+
+def dense_Liouvillian(instruction_list):
+    return sum(np.kron(dense(left),dense(right).T) for left, right in instruction_list)
+
+def test_make_Liouvillian_matches_dense_kron_sum():
+    dimer = make_dimer()
+    ins = make_dimer_instructions(dimer)
+    L = dimer.make_Liouvillian(ins)
+    assert issparse(L)
+    assert np.allclose(L.toarray(),dense_Liouvillian(ins))
+    assert len(dimer.merge_instructions(ins)) < len(ins)
+
+def test_LiouvillianOperator_matches_dense_Liouvillian():
+    dimer = make_dimer()
+    ins = make_dimer_instructions(dimer)
+    L = dense_Liouvillian(ins)
+    L_op = dimer.make_Liouvillian_operator(ins)
+    rng = np.random.default_rng(1)
+    v = rng.standard_normal(16) + 1j*rng.standard_normal(16)
+    assert np.allclose(L_op.matvec(v),L.dot(v))
+    assert np.allclose(L_op.rmatvec(v),L.conj().T.dot(v))
+    assert np.allclose(L_op.toarray(),L)
+
+def test_block_diagonal_eig_matches_dense_eig():
+    dimer = make_dimer()
+    # Pure dephasing keeps the coherence sectors uncoupled, so L has 
+    # several blocks
+    O = np.diag(dimer.occupied_diagonal_list[0])
+    ins = dimer.make_commutator_instructions(-1j*dimer.electronic_hamiltonian)
+    ins += dimer.make_Lindblad_instructions(0.1,O)
+    L = dimer.make_Liouvillian(ins)
+    eigvals, eigvecs = dimer.block_diagonal_eig(L)
+    eigvals_ref = np.linalg.eigvals(L.toarray())
+    assert np.allclose(np.sort_complex(np.round(eigvals,8)),np.sort_complex(np.round(eigvals_ref,8)))
+    assert np.allclose(L.dot(eigvecs),eigvecs*eigvals[np.newaxis,:])
+    eigvecs_left = dimer.invert_eigenvectors(eigvecs)
+    assert np.allclose(eigvecs_left.dot(eigvecs),np.eye(eigvals.size))
@@ -1,16 +1,19 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib
-from scipy.sparse import csr_matrix, identity, kron
-from scipy.sparse.linalg import eigs, eigsh
+from scipy.sparse import identity, kron, issparse, diags
+from scipy.sparse.linalg import eigs, eigsh, LinearOperator
+from scipy.sparse.csgraph import connected_components
 import itertools
-from scipy.linalg import block_diag, eig, expm, eigh
+from scipy.linalg.blas import zgemm
+from scipy.linalg import block_diag, eig, expm, eigh, get_lapack_funcs
 from scipy.sparse import save_npz, load_npz, csr_matrix, csc_matrix
 import yaml
 import copy
 import warnings
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from .eigenstates import AnharmonicDisplaced
 
@@ -50,6 +53,7 @@ class Polymer:
 
         ### Kron up the single 2LS operators to act on the full Hilbert space of the polymer
 
+        self.set_site_occupation_numbers()
         self.set_up_list()
         self.set_down_list()
         self.set_occupied_list()
@@ -73,16 +77,41 @@ class Polymer:
 
     def electronic_identity_kron(self,element_list):
         """Takes in a list of tuples (element, position)
+"""
+        rows, cols, data = self.electronic_identity_kron_entries(element_list)
+        size = self.N**self.num_sites
+        O = np.zeros((size,size),dtype=data.dtype)
+        O[rows,cols] = data
+        return O
+
+    def electronic_identity_kron_entries(self,element_list):
+        """Takes in a list of tuples (element, position) and returns the 
+            nonzero entries (rows, cols, data) of the Kronecker product of 
+            those elements with identities on all other sites. The entries 
+            are found by flipping the bits of each position, so no 
+            intermediate Kronecker products are formed
 """
         num_identities = self.num_sites - len(element_list)
         if num_identities < 0:
             raise ValueError('Too many elements for Hilbert space')
 
-        matrix_list = [self.ii for j in range(self.num_sites)]
+        rows = np.arange(self.N**self.num_sites)
+        cols = rows.copy()
+        data = np.ones(rows.size,dtype=np.result_type(self.ii,*[el for el, pos in element_list]))
 
         for el, pos in element_list:
-            matrix_list[pos] = el
-        return self.recursive_kron(matrix_list)
+            bit = 1 << (self.num_sites - 1 - pos)
+            seeds = (rows & bit) == 0
+            rows, cols, data = rows[seeds], cols[seeds], data[seeds]
+            new_rows, new_cols, new_data = [rows[:0]], [cols[:0]], [data[:0]]
+            for a, b in zip(*np.nonzero(el)):
+                new_rows.append(rows | (a*bit))
+                new_cols.append(cols | (b*bit))
+                new_data.append(data * el[a,b])
+            rows = np.concatenate(new_rows)
+            cols = np.concatenate(new_cols)
+            data = np.concatenate(new_data)
+        return rows, cols, data
 
     def recursive_kron(self,list_of_matrices):
         mat = list_of_matrices.pop(0)
@@ -102,6 +131,13 @@ class Polymer:
             O_list.append(Oi)
         return O_list
 
+    def make_single_diagonal_operator_list(self,O):
+        """Make a list of the diagonals of the full-space operators for a 
+            given diagonal 2x2 operator, using the site occupation numbers
+"""
+        occ = self.site_occupation_numbers
+        return [O[1,1]*occ[i] + O[0,0]*(1-occ[i]) for i in range(self.num_sites)]
+
     def make_multi_operator_list(self,o_list):
         """Make a list of full-space operators for a given set of 2x2 
             operators by inserting the necessary identities
@@ -113,8 +149,44 @@ class Polymer:
             O_list.append(Oi)
         return O_list
 
+    def make_sparse_multi_operator_list(self,o_list):
+        """Same as make_multi_operator_list, but each operator is built 
+            directly as a csr_matrix from its nonzero entries
+"""
+        O_list = []
+        size = self.N**self.num_sites
+        positions = itertools.combinations(range(self.num_sites),len(o_list))
+        for pos_tuple in positions:
+            rows, cols, data = self.electronic_identity_kron_entries(list(zip(o_list,pos_tuple)))
+            O_list.append(csr_matrix((data,(rows,cols)),shape=(size,size)))
+        return O_list
+
     def set_occupied_list(self):
-        self.occupied_list = self.make_single_operator_list(self.occupied)
+        self.occupied_diagonal_list = self.make_single_diagonal_operator_list(self.occupied)
+
+    @property
+    def occupied_list(self):
+        """Dense full-space occupied projectors of each site.  Built from
+            occupied_diagonal_list on first access only, since they cost
+            O(4**num_sites) memory per site
+"""
+        try:
+            return self._occupied_list
+        except AttributeError:
+            self._occupied_list = [np.diag(d) for d in self.occupied_diagonal_list]
+            return self._occupied_list
+
+    @property
+    def empty_list(self):
+        """Dense full-space empty projectors of each site.  Built from
+            empty_diagonal_list on first access only, since they cost
+            O(4**num_sites) memory per site
+"""
+        try:
+            return self._empty_list
+        except AttributeError:
+            self._empty_list = [np.diag(d) for d in self.empty_diagonal_list]
+            return self._empty_list
 
     def set_up_list(self):
         self.up_list = self.make_single_operator_list(self.up)
@@ -123,10 +195,20 @@ class Polymer:
         self.down_list = self.make_single_operator_list(self.down)
 
     def set_empty_list(self):
-        self.empty_list = self.make_single_operator_list(self.empty)
+        self.empty_diagonal_list = self.make_single_diagonal_operator_list(self.empty)
     
     def set_exchange_list(self):
-        self.exchange_list = self.make_multi_operator_list([self.up,self.down])
+        self.exchange_list = self.make_sparse_multi_operator_list([self.up,self.down])
+
+    def set_site_occupation_numbers(self):
+        """Stores the occupation (0 or 1) of each site in each state of the
+            full Hilbert space as an array of shape (num_sites, 2**num_sites).
+            Site 0 is the most significant bit, matching the Kronecker ordering
+"""
+        n = self.num_sites
+        states = np.arange(self.N**n)
+        bits = np.arange(n-1,-1,-1)
+        self.site_occupation_numbers = (states[np.newaxis,:] >> bits[:,np.newaxis]) & 1
 
     ### Tools for moving back and forth between full Hamiltonian and manifold(s)
 
@@ -140,19 +222,38 @@ class Polymer:
         return vec
 
     def set_electronic_total_occupation_number(self):
-        n = self.num_sites
-        single_mode_occ = np.arange(self.N)
-        occ_num = self.electronic_vector_of_ones_kron(0,single_mode_occ)
-        for i in range(1,n):
-            occ_num += self.electronic_vector_of_ones_kron(i,single_mode_occ)
+        occ_num = np.sum(self.site_occupation_numbers,axis=0)
         self.electronic_total_occupation_number = occ_num
+        self.set_manifold_index_structures()
+
+    def set_manifold_index_structures(self):
+        """Caches the indices of each electronic excitation manifold, and the
+            np.ix_ index pairs selecting each coherence between manifolds
+"""
+        occ_num = self.electronic_total_occupation_number
+        self.manifold_inds = [np.flatnonzero(occ_num == m) for m in range(self.num_sites+1)]
+        self.manifold_ix_pairs = dict()
+        for m1 in range(self.num_sites+1):
+            for m2 in range(self.num_sites+1):
+                self.manifold_ix_pairs[m1,m2] = np.ix_(self.manifold_inds[m1],self.manifold_inds[m2])
 
     def electronic_manifold_mask(self,manifold_num):
         """Creates a boolean mask to describe which states obey the truncation
            size collectively
 """
-        manifold_inds = np.where(self.electronic_total_occupation_number == manifold_num)[0]
-        return manifold_inds
+        if 0 <= manifold_num <= self.num_sites:
+            return self.manifold_inds[manifold_num]
+        return np.array([],dtype=self.manifold_inds[0].dtype)
+
+    def manifold_ix_pair(self,manifold1,manifold2):
+        """Returns the np.ix_ index pair selecting the coherence between 
+            manifold1 on the left and manifold2 on the right
+"""
+        try:
+            return self.manifold_ix_pairs[manifold1,manifold2]
+        except KeyError:
+            return np.ix_(self.electronic_manifold_mask(manifold1),
+                          self.electronic_manifold_mask(manifold2))
 
     def electronic_subspace_mask(self,min_occ_num,max_occ_num):
         """Creates a boolean mask to describe which states obey the range of 
@@ -166,11 +267,7 @@ class Polymer:
         """Returns result of projecting the Operator O onto manifold1
             on the left and manifold2 on the right
 """
-        manifold1_inds = self.electronic_manifold_mask(manifold1)
-        manifold2_inds = self.electronic_manifold_mask(manifold2)
-        O = O[manifold1_inds,:]
-        O = O[:,manifold2_inds]
-        return O
+        return O[self.manifold_ix_pair(manifold1,manifold2)]
     
     def extract_manifold(self,O,manifold_num):
         """Projects operator into the given electronic excitation manifold
@@ -183,11 +280,7 @@ class Polymer:
             a particular optical coherence between manifolds
 """
         Ofull = np.zeros(self.electronic_hamiltonian.shape,dtype=O.dtype)
-        manifold1_inds = self.electronic_manifold_mask(manifold1)
-        manifold2_inds = self.electronic_manifold_mask(manifold2)
-        for i in range(manifold2_inds.size):
-            ind = manifold2_inds[i]
-            Ofull[manifold1_inds,ind] = O[:,i]
+        Ofull[self.manifold_ix_pair(manifold1,manifold2)] = O
         return Ofull
     
     def manifold_to_full(self,O,manifold_num):
@@ -209,13 +302,14 @@ class Polymer:
     ### Tools for making the Hamiltonian
 
     def make_electronic_hamiltonian(self):
-        ham = self.energies[0] * self.occupied_list[0]
-        for i in range(1,self.num_sites):
-            ham += self.energies[i] * self.occupied_list[i]
+        # The site energies are diagonal, so they are summed as a single vector
+        site_energy_diagonal = np.dot(self.energies,np.array(self.occupied_diagonal_list))
+        ham = np.diag(site_energy_diagonal)
 
         for i in range(len(self.exchange_list)):
-            ham += self.couplings[i] * self.exchange_list[i]
-            ham += np.conjugate(self.couplings[i]) * self.exchange_list[i].T
+            X = self.exchange_list[i].tocoo()
+            ham[X.row,X.col] += self.couplings[i] * X.data
+            ham[X.col,X.row] += np.conjugate(self.couplings[i]) * X.data
 
         return ham
 
@@ -230,19 +324,20 @@ class Polymer:
 
     def make_manifold_eigensystem(self,manifold_num):
         h = self.get_electronic_hamiltonian(manifold_num = manifold_num)
-        e, v = np.linalg.eigh(h)
-        sort_inds = e.argsort()
-        e = e[sort_inds]
-        v = v[:,sort_inds]
+        # h is a copy of the manifold block, so it may be overwritten.
+        # Eigenvalues from eigh are returned in ascending order
+        e, v = eigh(h,driver='evr',check_finite=False,overwrite_a=True)
         return e,v
 
     def set_manifold_eigensystems(self):
-        self.electronic_eigenvalues_by_manifold = []
-        self.electronic_eigenvectors_by_manifold = []
-        for i in range(self.num_sites+1):
-            e,v = self.make_manifold_eigensystem(i)
-            self.electronic_eigenvalues_by_manifold.append(e)
-            self.electronic_eigenvectors_by_manifold.append(v)
+        # The manifolds are independent, and LAPACK releases the GIL, so
+        # the diagonalizations are run on a thread pool
+        num_manifolds = self.num_sites+1
+        max_workers = min(num_manifolds,os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self.make_manifold_eigensystem,range(num_manifolds)))
+        self.electronic_eigenvalues_by_manifold = [e for e,v in results]
+        self.electronic_eigenvectors_by_manifold = [v for e,v in results]
 
     def get_eigensystem_by_manifold(self,manifold_num):
         e = self.electronic_eigenvalues_by_manifold[manifold_num]
@@ -251,14 +346,12 @@ class Polymer:
 
     def set_electronic_eigensystem(self):
         H = self.electronic_hamiltonian
-        eigvecs = np.zeros(H.shape)
-        d = np.zeros(H.shape)
-        for i in range(self.num_sites+1):
-            e,v = self.get_eigensystem_by_manifold(i)
-            if i ==1:
-                self.exciton_energies = e
-            eigvecs += self.manifold_to_full(v,i)
-            d += self.manifold_to_full(np.diag(e),i)
+        self.exciton_energies = self.electronic_eigenvalues_by_manifold[1]
+        # The manifolds are disjoint blocks in a permutation P of the site basis
+        P = np.concatenate(self.manifold_inds)
+        invP = np.argsort(P)
+        eigvecs = block_diag(*self.electronic_eigenvectors_by_manifold)[np.ix_(invP,invP)]
+        d = np.diag(np.concatenate(self.electronic_eigenvalues_by_manifold)[invP])
         Hd = eigvecs.T.dot(H.dot(eigvecs))
         if np.allclose(Hd,d):
             pass
@@ -300,19 +393,72 @@ class Polymer:
 
 class LindbladConstructor:
 
+    identity_cache = dict()
+
+    @staticmethod
+    def shared_identity(size,*,sparse=False):
+        """Returns a read-only size x size identity, either a dense array or,
+            if sparse is True, a csr_matrix.  The same object is shared by
+            every instruction of that size and kind, rather than allocating
+            a new identity for each one
+"""
+        key = (size,sparse)
+        try:
+            return LindbladConstructor.identity_cache[key]
+        except KeyError:
+            if sparse:
+                II = identity(size,format='csr')
+                II.data.setflags(write=False)
+            else:
+                II = np.eye(size)
+                II.setflags(write=False)
+            LindbladConstructor.identity_cache[key] = II
+            return II
+
     @staticmethod
     def make_Lindblad_instructions(gamma,O):
         """O must be square
 """
-        II = np.eye(O.shape[0])
+        II = LindbladConstructor.shared_identity(O.shape[0])
         Od = np.conjugate(O.T)
         leftright = gamma * (-np.dot(Od,O)/2)
         return [(gamma*O,Od),(leftright,II),(II,leftright)]
 
+    @staticmethod
+    def make_Lindblad_instructions_list(gamma_list,O_list):
+        """Equivalent to concatenating make_Lindblad_instructions(gamma,O) 
+            for each pair in zip(gamma_list,O_list), but with the operators
+            stacked so that all of the products Od.O are done in a single 
+            batched matmul. All O must be square with the same shape
+"""
+        if len(O_list) == 0:
+            return []
+        O_stack = np.array(O_list)
+        Od_stack = np.conjugate(np.transpose(O_stack,axes=(0,2,1)))
+        OdO_stack = np.matmul(Od_stack,O_stack)
+        II = LindbladConstructor.shared_identity(O_stack.shape[1])
+        ins = []
+        for gamma, O, Od, OdO in zip(gamma_list,O_stack,Od_stack,OdO_stack):
+            leftright = gamma * (-OdO/2)
+            ins += [(gamma*O,Od),(leftright,II),(II,leftright)]
+        return ins
+
+    @staticmethod
+    def make_transition_Lindblad_instructions(gamma,i,j,size):
+        """Equivalent to make_Lindblad_instructions(gamma,O), where O is the
+            size x size operator |i><j|, but with every operator stored as a 
+            sparse csr_matrix.  Od.O = |j><j| is written down directly
+"""
+        gammaO = csr_matrix(([gamma],([i],[j])),shape=(size,size))
+        Od = csr_matrix(([1.0],([j],[i])),shape=(size,size))
+        leftright = csr_matrix(([-gamma/2],([j],[j])),shape=(size,size))
+        II = LindbladConstructor.shared_identity(size,sparse=True)
+        return [(gammaO,Od),(leftright,II),(II,leftright)]
+
     @staticmethod
     def make_Lindblad_instructions2(gamma,Oket,Obra):
-        IIket = np.eye(Oket.shape[0])
-        IIbra = np.eye(Obra.shape[0])
+        IIket = LindbladConstructor.shared_identity(Oket.shape[0])
+        IIbra = LindbladConstructor.shared_identity(Obra.shape[0])
         Oketd = np.conjugate(Oket.T)
         Obrad = np.conjugate(Obra.T)
         left = gamma * (-np.dot(Oketd,Oket)/2)
@@ -321,43 +467,187 @@ class LindbladConstructor:
 
     @staticmethod
     def make_Lindblad_instructions2_Obra0(gamma,Oket,Obra):
-        IIbra = np.eye(Obra.shape[0])
+        IIbra = LindbladConstructor.shared_identity(Obra.shape[0])
         Oketd = np.conjugate(Oket.T)
         left = gamma * (-np.dot(Oketd,Oket)/2)
         return [(left,IIbra)]
 
     @staticmethod
     def make_Lindblad_instructions2_Oket0(gamma,Oket,Obra):
-        IIket = np.eye(Oket.shape[0])
+        IIket = LindbladConstructor.shared_identity(Oket.shape[0])
         Obrad = np.conjugate(Obra.T)
         right = gamma * (-np.dot(Obrad,Obra)/2)
         return [(IIket,right)]
 
+    @staticmethod
+    def make_transition_Lindblad_instructions2_Obra0(gamma,i,j,ket_size,bra_size):
+        """Equivalent to make_Lindblad_instructions2_Obra0(gamma,Oket,Obra),
+            where Oket = |i><j|, using sparse csr_matrix operators
+"""
+        left = csr_matrix(([-gamma/2],([j],[j])),shape=(ket_size,ket_size))
+        IIbra = LindbladConstructor.shared_identity(bra_size,sparse=True)
+        return [(left,IIbra)]
+
+    @staticmethod
+    def make_transition_Lindblad_instructions2_Oket0(gamma,i,j,ket_size,bra_size):
+        """Equivalent to make_Lindblad_instructions2_Oket0(gamma,Oket,Obra),
+            where Obra = |i><j|, using sparse csr_matrix operators
+"""
+        IIket = LindbladConstructor.shared_identity(ket_size,sparse=True)
+        right = csr_matrix(([-gamma/2],([j],[j])),shape=(bra_size,bra_size))
+        return [(IIket,right)]
+
 class LiouvillianConstructor(LindbladConstructor):
 
     @staticmethod
     def make_commutator_instructions(O):
         """O must be square
 """
-        II = np.eye(O.shape[0])
+        II = LindbladConstructor.shared_identity(O.shape[0])
         return [(O,II),(II,-O)]
 
     @staticmethod
     def make_commutator_instructions2(Oket,Obra):
         """
 """
-        IIket = np.eye(Oket.shape[0])
-        IIbra = np.eye(Obra.shape[0])
+        IIket = LindbladConstructor.shared_identity(Oket.shape[0])
+        IIbra = LindbladConstructor.shared_identity(Obra.shape[0])
         return [(Oket,IIbra),(IIket,-Obra)]
 
+    @staticmethod
+    def ket_superoperator_dot(O,V):
+        """Returns np.kron(O,II).dot(V), where each column of V is a vectorized
+            density matrix, without forming the Kronecker product
+"""
+        size = O.shape[1]
+        num_cols = V.shape[-1]
+        V = V.reshape(size,-1)
+        return O.dot(V).reshape(-1,num_cols)
+
+    @staticmethod
+    def bra_superoperator_dot(O,V):
+        """Returns np.kron(II,O.T).dot(V), where each column of V is a vectorized
+            density matrix, without forming the Kronecker product
+"""
+        size = O.shape[0]
+        V = V.reshape(-1,size,V.shape[-1])
+        return np.matmul(O.T,V).reshape(-1,V.shape[-1])
+
+    @staticmethod
+    def sum_operators(O_list):
+        """Returns the sum of a list of same-shaped operators.  The sum is 
+            sparse if every operator is sparse, and a dense array otherwise
+"""
+        if len(O_list) == 1:
+            return O_list[0]
+        if all(issparse(O) for O in O_list):
+            total = csr_matrix(O_list[0],copy=True)
+            for O in O_list[1:]:
+                total = total + O
+            return total
+        total = np.zeros(O_list[0].shape,dtype=np.result_type(*[O.dtype for O in O_list]))
+        for O in O_list:
+            if issparse(O):
+                total += O.toarray()
+            else:
+                total += O
+        return total
+
+    @staticmethod
+    def merge_instructions(instruction_list):
+        """Returns an instruction list defining the same Liouvillian, with
+            every group of instructions that share the same right operand
+            object, and then the same left operand object, merged into one,
+            using kron(A,R) + kron(B,R) = kron(A+B,R).  The shared identities
+            make most instructions mergeable, so the list becomes much shorter
+"""
+        for side in [1,0]:
+            groups = dict()
+            for ins in instruction_list:
+                groups.setdefault(id(ins[side]),[]).append(ins)
+            instruction_list = []
+            for group in groups.values():
+                shared = group[0][side]
+                merged = LiouvillianConstructor.sum_operators([ins[1-side] for ins in group])
+                if side == 1:
+                    instruction_list.append((merged,shared))
+                else:
+                    instruction_list.append((shared,merged))
+        return instruction_list
+
     @staticmethod
     def make_Liouvillian(instruction_list):
-        left, right = instruction_list[0]
-        L = np.kron(left,right.T)
-        for left,right in instruction_list[1:]:
-            L = L + np.kron(left,right.T)
+        """Assembles the Liouvillian as a sparse csr_matrix.  Most operands
+            are identities or very sparse local operators, so the nonzero
+            (row, col, data) entries of every Kronecker product are collected
+            in a single pass and summed by one csr_matrix construction.
+            Instructions sharing an operand are merged first.  Returns a
+            csr_matrix rather than a dense array; call .toarray() where a 
+            dense Liouvillian is needed.  An empty instruction list gives an
+            empty (0, 0) matrix
+"""
+        if len(instruction_list) == 0:
+            return csr_matrix((0,0))
+        rows = []
+        cols = []
+        data = []
+        for left,right in LiouvillianConstructor.merge_instructions(instruction_list):
+            left = csr_matrix(left).tocoo()
+            right = csr_matrix(right.T).tocoo()
+            shape = (left.shape[0]*right.shape[0],left.shape[1]*right.shape[1])
+            rows.append((left.row[:,np.newaxis]*right.shape[0] + right.row[np.newaxis,:]).ravel())
+            cols.append((left.col[:,np.newaxis]*right.shape[1] + right.col[np.newaxis,:]).ravel())
+            data.append(np.outer(left.data,right.data).ravel())
+        L = csr_matrix((np.concatenate(data),(np.concatenate(rows),np.concatenate(cols))),
+                       shape=shape)
+        L.eliminate_zeros()
         return L
 
+    @staticmethod
+    def make_Liouvillian_operator(instruction_list):
+        """Returns a lazy LiouvillianOperator, which applies the Liouvillian
+            defined by instruction_list without assembling it
+"""
+        return LiouvillianOperator(instruction_list)
+
+class LiouvillianOperator(LinearOperator):
+
+    def __init__(self,instruction_list):
+        """Lazy representation of the Liouvillian sum_k kron(left_k,right_k.T)
+            defined by a list of (left,right) instructions. Uses the identity
+            kron(left,right.T) vec(rho) = vec(left rho right), so that a 
+            matvec costs O(#instructions * d^3) rather than O(d^4), and the 
+            d^2 x d^2 matrix is never stored.  Works with scipy.sparse.linalg
+            routines such as eigs or expm_multiply
+"""
+        self.instructions = LiouvillianConstructor.merge_instructions(instruction_list)
+        left, right = self.instructions[0]
+        self.ket_size = left.shape[0]
+        self.bra_size = right.shape[0]
+        size = self.ket_size * self.bra_size
+        dtype = np.result_type(*[O.dtype for ins in instruction_list for O in ins])
+        super().__init__(dtype=dtype,shape=(size,size))
+
+    def _matvec(self,v):
+        rho = v.reshape(self.ket_size,self.bra_size)
+        drho = np.zeros(rho.shape,dtype=np.result_type(self.dtype,rho))
+        for left, right in self.instructions:
+            drho += left @ rho @ right
+        return drho.ravel()
+
+    def _rmatvec(self,v):
+        rho = v.reshape(self.ket_size,self.bra_size)
+        drho = np.zeros(rho.shape,dtype=np.result_type(self.dtype,rho))
+        for left, right in self.instructions:
+            drho += left.conj().T @ rho @ right.conj().T
+        return drho.ravel()
+
+    def tocsr(self):
+        return LiouvillianConstructor.make_Liouvillian(self.instructions)
+
+    def toarray(self):
+        return self.tocsr().toarray()
+
 class OpenPolymer(Polymer,LiouvillianConstructor):
 
     def __init__(self,site_energies,site_couplings,dipoles):
@@ -376,10 +666,8 @@ class OpenPolymer(Polymer,LiouvillianConstructor):
         self.kT = 0
         
     def optical_dephasing_operator(self):
-        total_deph = self.occupied_list[0].copy()
-        for i in range(1,len(self.occupied_list)):
-            total_deph += self.occupied_list[i]
-        return total_deph
+        total_deph = np.sum(self.occupied_diagonal_list,axis=0)
+        return np.diag(total_deph)
 
     def optical_dephasing_instructions(self):
         O = self.optical_dephasing_operator()
@@ -413,23 +701,49 @@ class OpenPolymer(Polymer,LiouvillianConstructor):
             E1_to_E2 = np.exp(-E2/self.kT)/Z
         return E2_to_E1, E1_to_E2
 
+    def boltzmann_factors_array(self,E1,E2):
+        """Vectorized version of boltzmann_factors, for arrays of energies
+            E1 and E2 (which are broadcast against each other)
+"""
+        # Broadcasting is deferred, so that each np.exp is only taken over
+        # the energies actually passed in (e.g. E[:,None] and E[None,:])
+        E1 = np.asarray(E1,dtype='float')
+        E2 = np.asarray(E2,dtype='float')
+        # Zero temperature limit: everything relaxes to the lower energy
+        b1 = np.where(E1 < E2,1.0,0.0)
+        b2 = 1 - b1
+        if self.kT != 0:
+            with np.errstate(divide='ignore',invalid='ignore'):
+                w1 = np.exp(-E1/self.kT)
+                w2 = np.exp(-E2/self.kT)
+                Z = w1 + w2
+                underflow = np.isclose(Z,0)
+                b1 = np.where(underflow,b1,w1/Z)
+                b2 = np.where(underflow,b2,w2/Z)
+        equal = E1 == E2
+        b1 = np.where(equal,0.5,b1)
+        b2 = np.where(equal,0.5,b2)
+        return np.broadcast_arrays(b1,b2)
+
     def optical_relaxation_instructions(self):
         eg = 0
-        ins_list = []
+        gamma_list = []
+        O_list = []
         gamma = self.optical_relaxation_gamma
+        bg_all, bn_all = self.boltzmann_factors_array(eg,self.energies)
         for n in range(len(self.energies)):
-            en = self.energies[n]
-            bg, bn = self.boltzmann_factors(eg,en)
+            bg = bg_all[n]
+            bn = bn_all[n]
             O = self.up_list[n]
-            instructions2 = self.make_Lindblad_instructions(gamma * bg,O.T)
-            ins_list += instructions2
+            gamma_list.append(gamma * bg)
+            O_list.append(O.T)
             if np.isclose(bn,0):
                 pass
             else:
-                instructions1 = self.make_Lindblad_instructions(gamma * bn,O)
-                ins_list += instructions1
+                gamma_list.append(gamma * bn)
+                O_list.append(O)
 
-        return ins_list
+        return self.make_Lindblad_instructions_list(gamma_list,O_list)
 
     def optical_relaxation_Liouvillian(self):
         inst_list = self.optical_relaxation_instructions()
@@ -437,22 +751,25 @@ class OpenPolymer(Polymer,LiouvillianConstructor):
         return L
 
     def site_to_site_relaxation_instructions(self):
-        nm = itertools.combinations(range(len(self.energies)),2)
+        nm = list(itertools.combinations(range(len(self.energies)),2))
         i = 0
-        ins_list = []
+        gamma_list = []
+        O_list = []
         gamma = self.site_to_site_relaxation_gamma
+        if len(nm) == 0:
+            return []
+        energies = np.asarray(self.energies)
+        n_inds, m_inds = np.array(nm).T
+        bn_all, bm_all = self.boltzmann_factors_array(energies[n_inds],energies[m_inds])
         for n,m in nm:
-            en = self.energies[n]
-            em = self.energies[m]
-            bn,bm = self.boltzmann_factors(en,em)
-            O = self.exchange_list[i]
-            instructions1 = self.make_Lindblad_instructions(gamma * bn,O)
-            instructions2 = self.make_Lindblad_instructions(gamma * bm,O.T)
-            ins_list += instructions1
-            ins_list += instructions2
+            bn = bn_all[i]
+            bm = bm_all[i]
+            O = self.exchange_list[i].toarray()
+            gamma_list += [gamma * bn, gamma * bm]
+            O_list += [O, O.T]
             i+=1
 
-        return ins_list
+        return self.make_Lindblad_instructions_list(gamma_list,O_list)
 
     def site_to_site_relaxation_Liouvillian(self):
         inst_list = self.site_to_site_relaxation_instructions()
@@ -460,18 +777,21 @@ class OpenPolymer(Polymer,LiouvillianConstructor):
         return L
 
     def site_to_site_dephasing_operator_list(self):
-        s_deph_list = []
-        for (i,j) in itertools.combinations(range(self.num_sites),2):
-            s_deph_list.append(self.occupied_list[i] - self.occupied_list[j])
-        return s_deph_list
+        pairs = list(itertools.combinations(range(self.num_sites),2))
+        if len(pairs) == 0:
+            return []
+        # The occupation operators are diagonal, so all of the pair 
+        # differences are formed at once from the site occupation numbers
+        i_inds, j_inds = np.array(pairs).T
+        occ = np.array(self.occupied_diagonal_list)
+        diagonal_differences = occ[i_inds,:] - occ[j_inds,:]
+        return [np.diag(d) for d in diagonal_differences]
 
     def all_site_dephasing_instructions(self):
         s_deph_list = self.site_to_site_dephasing_operator_list()
-        Lindblad_instruction_list = []
         gamma = self.site_to_site_dephasing_gamma
-        for O in s_deph_list:
-            Lindblad_instruction_list += self.make_Lindblad_instructions(gamma,O)
-        return Lindblad_instruction_list
+        gamma_list = [gamma for O in s_deph_list]
+        return self.make_Lindblad_instructions_list(gamma_list,s_deph_list)
 
     def all_site_dephasing_Liouvillian(self):
         inst_list = self.all_site_dephasing_instructions()
@@ -510,8 +830,138 @@ class OpenPolymer(Polymer,LiouvillianConstructor):
         
         self.L = drho
 
-    def eigfun(self,L,*,check_eigenvectors = True,invert = True,populations_only = False):
-        eigvals, eigvecs = np.linalg.eig(L)
+    @staticmethod
+    def is_hermitian(L,*,rtol=1E-10):
+        """Returns True if every element of L - L^H is within rtol times the
+            largest element of L
+"""
+        D = L - L.conj().T
+        if issparse(D):
+            D = D.tocsr()
+            return D.nnz == 0 or abs(D).max() <= rtol*abs(L).max()
+        return np.abs(D).max(initial=0) <= rtol*np.abs(L).max(initial=0)
+
+    @staticmethod
+    def block_diagonal_eig(L,*,hermitian=False):
+        """Diagonalizes L one block at a time. Blocks are the connected
+            components of the sparsity pattern of L (for instance the 
+            coherence sectors between electronic manifolds), so the result
+            is the same as diagonalizing L in one call, but the cost is the 
+            sum of the cubes of the block sizes.  If hermitian is True the 
+            blocks are diagonalized with eigh
+"""
+        if hermitian:
+            def dense_eig(A,overwrite_a):
+                e, v = eigh(A,driver='evr',check_finite=False,overwrite_a=overwrite_a)
+                return e.astype('complex'), v
+        else:
+            def dense_eig(A,overwrite_a):
+                return eig(A,check_finite=False,overwrite_a=overwrite_a)
+        # Only the sparsity pattern is needed, and a boolean graph avoids
+        # casting complex values to the float weights connected_components uses
+        pattern = csr_matrix(L,copy=True)
+        pattern.eliminate_zeros()
+        pattern = csr_matrix((np.ones(pattern.nnz,dtype=bool),pattern.indices,pattern.indptr),
+                             shape=pattern.shape)
+        num_blocks, labels = connected_components(pattern,directed=True,connection='weak')
+        if num_blocks == 1:
+            if issparse(L):
+                eigvals, eigvecs = dense_eig(L.toarray(),True)
+            else:
+                eigvals, eigvecs = dense_eig(L,False)
+        else:
+            blocks = []
+            for n in range(num_blocks):
+                inds = np.where(labels == n)[0]
+                L_block = L[inds,:][:,inds]
+                if issparse(L_block):
+                    L_block = L_block.toarray()
+                # L_block is a copy, so it may be overwritten
+                e, v = dense_eig(L_block,True)
+                blocks.append((inds,e,v))
+
+            dtype = np.result_type(*[v for inds,e,v in blocks])
+            eigvals = np.zeros(L.shape[0],dtype='complex')
+            eigvecs = np.zeros(L.shape,dtype=dtype)
+            for inds, e, v in blocks:
+                eigvals[inds] = e
+                eigvecs[np.ix_(inds,inds)] = v
+        
+        if not np.iscomplexobj(eigvecs):
+            # All eigenvalues of a real L are real, so match np.linalg.eig
+            eigvals = eigvals.real
+        return eigvals, eigvecs
+
+    @staticmethod
+    def invert_eigenvectors(eigvecs):
+        """Returns the left eigenvectors as the inverse of the right eigenvectors,
+            using an LU factorization. Falls back to the pseudo-inverse if the 
+            eigenvectors are singular or numerically singular (defective 
+            Liouvillian), as detected from the LAPACK return code and the 
+            diagonal of U
+"""
+        n = eigvecs.shape[0]
+        if n == 0:
+            return np.zeros(eigvecs.shape,dtype=eigvecs.dtype)
+        getrf, getrs = get_lapack_funcs(('getrf','getrs'),(eigvecs,))
+        lu, piv, info = getrf(eigvecs)
+        if info < 0:
+            raise ValueError('illegal value in argument {} of getrf'.format(-info))
+        u_diag = np.abs(np.diag(lu))
+        if info > 0 or u_diag.min() <= n*np.finfo(lu.dtype).eps*u_diag.max():
+            return np.linalg.pinv(eigvecs)
+        inv, info = getrs(lu,piv,np.eye(n,dtype=lu.dtype))
+        if info != 0:
+            return np.linalg.pinv(eigvecs)
+        return inv
+
+    @staticmethod
+    def check_diagonalization(L,eigvals,eigvecs,eigvecs_left):
+        """Warns if eigvecs and eigvecs_left do not diagonalize L to tolerance.
+            Rather than forming eigvecs_left.dot(L.dot(eigvecs)), which costs 
+            a dense matrix product in the full Liouville space, this checks 
+            the residual L.dot(eigvecs) - eigvecs*eigvals of every right 
+            eigenvector (cheap for sparse L) together with the diagonal of
+            eigvecs_left.dot(L.dot(eigvecs))
+"""
+        LV = L.dot(eigvecs)
+        if issparse(eigvecs):
+            # Sparse eigenvectors (see eigfun2) are checked without densifying
+            LV = csr_matrix(LV)
+            VE = csr_matrix(eigvecs.dot(diags(eigvals)))
+            D_diag = np.asarray(csr_matrix(eigvecs_left).multiply(LV.T).sum(axis=1)).ravel()
+            R = (LV - VE).tocoo()
+            residual = np.abs(R.data)
+            if R.nnz:
+                scale = np.abs(np.asarray(VE[R.row,R.col]).ravel())
+            else:
+                scale = residual
+            LV_deviation = residual.max(initial=0)
+            LV_close = np.all(residual <= 1E-10 + 1E-10*scale)
+        else:
+            if issparse(LV):
+                LV = LV.toarray()
+            VE = eigvecs * eigvals[np.newaxis,:]
+            D_diag = np.einsum('ij,ji->i',eigvecs_left,LV)
+            LV_deviation = np.max(np.abs(LV - VE))
+            LV_close = np.allclose(LV,VE,rtol=1E-10,atol=1E-10)
+        deviation = max(LV_deviation,np.max(np.abs(D_diag - eigvals)))
+        if LV_close and np.allclose(D_diag,eigvals,rtol=1E-10,atol=1E-10):
+            pass
+        else:
+            warnings.warn('Using eigenvectors to diagonalize Liouvillian does not result in the expected diagonal matrix to tolerance, largest deviation is {}'.format(deviation))
+
+    def eigfun(self,L,*,check_eigenvectors = True,invert = True,populations_only = False,store = True):
+        """Returns the eigenvalues, right eigenvectors and left eigenvectors of
+            L.  If store is True they are also recorded in self.eigenvalues and
+            self.eigenvectors.  Pass store = False when calling from a worker
+            thread, so that no shared attributes are written
+"""
+        if isinstance(L,LiouvillianOperator):
+            L = L.tocsr()
+        # Checking costs far less than the eig it can replace
+        hermitian = self.is_hermitian(L)
+        eigvals, eigvecs = self.block_diagonal_eig(L,hermitian=hermitian)
 
         eigvals = np.round(eigvals,12)
         sort_indices = eigvals.argsort()
@@ -532,10 +982,15 @@ class OpenPolymer(Polymer,LiouvillianConstructor):
                     trace_norm = eigvecs[:,i].reshape(shape,shape).trace()
                     eigvecs[:,i] = eigvecs[:,i] / trace_norm
 
-        if invert:
-            eigvecs_left = np.linalg.pinv(eigvecs)
+        if invert and hermitian:
+            # The eigenvectors are orthogonal, so the inverse is V^H with
+            # the rescaling of each column above undone
+            eigvecs_left = eigvecs.conj().T / np.sum(np.abs(eigvecs)**2,axis=0)[:,np.newaxis]
+        elif invert:
+            eigvecs_left = self.invert_eigenvectors(eigvecs)
         else:
-            eigvals_left, eigvecs_left = np.linalg.eig(L.T)
+            L_dense = L.toarray() if issparse(L) else L
+            eigvals_left, eigvecs_left = np.linalg.eig(L_dense.T)
 
             eigvals_left = np.round(eigvals_left,12)
             sort_indices_left = eigvals_left.argsort()
@@ -547,69 +1002,102 @@ class OpenPolymer(Polymer,LiouvillianConstructor):
                     eigvecs_left[i,:] *= 1/norm
 
         if check_eigenvectors:
-            LV = L.dot(eigvecs)
-            D = eigvecs_left.dot(LV)
-            if np.allclose(D,np.diag(eigvals),rtol=1E-10,atol=1E-10):
-                pass
-            else:
-                warnings.warn('Using eigenvectors to diagonalize Liouvillian does not result in the expected diagonal matrix to tolerance, largest deviation is {}'.format(np.max(np.abs(D - np.diag(eigvals)))))
+            self.check_diagonalization(L,eigvals,eigvecs,eigvecs_left)
 
-        self.eigenvalues = eigvals
-        self.eigenvectors = {'left':eigvecs_left,'right':eigvecs}
+        if store:
+            self.eigenvalues = eigvals
+            self.eigenvectors = {'left':eigvecs_left,'right':eigvecs}
 
         return eigvals, eigvecs, eigvecs_left
 
     def save_L(self,dirname):
-        save_npz(os.path.join(dirname,'L.npz'),csr_matrix(self.L))
+        if isinstance(self.L,LiouvillianOperator):
+            L = self.L.tocsr()
+        else:
+            L = csr_matrix(self.L)
+        save_npz(os.path.join(dirname,'L.npz'),L)
+
+    @staticmethod
+    def manifold_key_to_str(key):
+        """Returns the name under which key is saved: 'ij' for the coherence
+            key (i,j), and 'ij_to_kl' for the dipole key ((i,j),(k,l))
+"""
+        if isinstance(key[0],tuple):
+            return '_to_'.join(OpenPolymer.manifold_key_to_str(k) for k in key)
+        i,j = key
+        return str(i) + str(j)
+
+    @staticmethod
+    def manifold_dict_to_str_keys(d):
+        """Returns a copy of d with its keys converted by manifold_key_to_str,
+            for use with np.savez
+"""
+        return {OpenPolymer.manifold_key_to_str(key):value for key,value in d.items()}
 
     def save_L_by_manifold(self):
-        np.savez(os.path.join(self.base_path,'L.npz'),**self.L_by_manifold)
+        L_dense = {self.manifold_key_to_str(key):L.toarray() for key,L in self.L_by_manifold.items()}
+        np.savez(os.path.join(self.base_path,'L.npz'),**L_dense)
 
     def save_eigsystem(self,dirname):
         np.savez(os.path.join(dirname,'right_eigenvectors.npz'),all_manifolds = self.eigenvectors['right'])
         np.savez(os.path.join(dirname,'left_eigenvectors.npz'),all_manifolds = self.eigenvectors['left'])
         np.savez(os.path.join(dirname,'eigenvalues.npz'),all_manifolds = self.eigenvalues)
 
+    @staticmethod
+    def eigenbasis_transform(evl,mu_ev,*,dtype='complex64'):
+        """Computes evl.dot(mu_ev) with zgemm, and stores the product in the 
+            x-polarization slice of a Fortran-ordered (N,N,3) array of the 
+            given dtype, which is returned.  The saved dipoles default to 
+            complex64 to halve their size on disk and in memory.  For 
+            complex128 the product is written directly into the slice
+"""
+        N = evl.shape[0]
+        mu_3d = np.zeros((N,mu_ev.shape[1],3),dtype=dtype,order='F')
+        if mu_3d.dtype == np.complex128:
+            mu_t = zgemm(1.0,evl,mu_ev,c=mu_3d[:,:,0],overwrite_c=1)
+        else:
+            mu_t = zgemm(1.0,evl,mu_ev)
+        if not np.shares_memory(mu_t,mu_3d):
+            mu_3d[:,:,0] = mu_t
+        return mu_3d
+
+    @staticmethod
+    def dipole_mask(mu_t,mu_mask_tol):
+        """Boolean mask of the elements of mu_t that do not vanish when rounded
+            to mu_mask_tol decimal places
+"""
+        return np.abs(mu_t) > 0.5*10**(-mu_mask_tol)
+
     def save_mu(self,dirname,*,mask=True):
         evl = self.eigenvectors['left']
         ev = self.eigenvectors['right']
         
-        II = np.eye(self.mu.shape[0])
-        mu_ket = np.kron(self.mu,II.T)
-        mu_bra = np.kron(II,self.mu.T)
-
         mu_mask_tol = 10
 
-        mu_ket_t = np.dot(np.dot(evl,mu_ket),ev)
-        mu_ket_3d = np.zeros((mu_ket_t.shape[0],mu_ket_t.shape[0],3),dtype='complex')
-        mu_ket_3d[:,:,0] = mu_ket_t
+        mu_ket_3d = self.eigenbasis_transform(evl,self.ket_superoperator_dot(self.mu,ev))
+        mu_ket_t = mu_ket_3d[:,:,0]
 
-        mu_bra_t = np.dot(np.dot(evl,mu_bra),ev)
-        mu_bra_3d = np.zeros((mu_bra_t.shape[0],mu_bra_t.shape[0],3),dtype='complex')
-        mu_bra_3d[:,:,0] = mu_bra_t
+        mu_bra_3d = self.eigenbasis_transform(evl,self.bra_superoperator_dot(self.mu,ev))
+        mu_bra_t = mu_bra_3d[:,:,0]
 
         if mask:
-            ket_mask = np.zeros(mu_ket_t.shape,dtype='bool')
-            ket_mask[:,:] = np.round(mu_ket_t,mu_mask_tol)[:,:]
-            mu_ket_t_masked = mu_ket_t * ket_mask
-            mu_ket_3d_masked = np.zeros((mu_ket_t.shape[0],mu_ket_t.shape[0],3),dtype='complex')
-            mu_ket_3d_masked[:,:,0] = mu_ket_t_masked
-
-            bra_mask = np.zeros(mu_bra_t.shape,dtype='bool')
-            bra_mask[:,:] = np.round(mu_bra_t,mu_mask_tol)[:,:]
-            mu_bra_t_masked = mu_bra_t * bra_mask
-            mu_bra_3d_masked = np.zeros((mu_ket_t.shape[0],mu_ket_t.shape[0],3),dtype='complex')
-            mu_bra_3d_masked[:,:,0] = mu_bra_t_masked
-
-            np.savez(os.path.join(dirname,'mu.npz'),ket=mu_ket_3d,bra=mu_bra_3d)
+            ket_mask = self.dipole_mask(mu_ket_t,mu_mask_tol)
+            mu_ket_3d_masked = np.zeros(mu_ket_3d.shape,dtype=mu_ket_3d.dtype,order='F')
+            np.copyto(mu_ket_3d_masked[:,:,0],mu_ket_t,where=ket_mask)
+
+            bra_mask = self.dipole_mask(mu_bra_t,mu_mask_tol)
+            mu_bra_3d_masked = np.zeros(mu_bra_3d.shape,dtype=mu_bra_3d.dtype,order='F')
+            np.copyto(mu_bra_3d_masked[:,:,0],mu_bra_t,where=bra_mask)
+
+            np.savez_compressed(os.path.join(dirname,'mu.npz'),ket=mu_ket_3d,bra=mu_bra_3d)
             np.savez(os.path.join(dirname,'eigenvalues.npz'),all_manifolds=self.eigenvalues)
             np.savez(os.path.join(dirname,'right_eigenvectors.npz'),all_manifolds=ev)
             np.savez(os.path.join(dirname,'left_eigenvectors.npz'),all_manifolds=evl)
             np.savez(os.path.join(dirname,'mu_boolean.npz'),ket=ket_mask,bra=bra_mask)
-            np.savez(os.path.join(dirname,'mu_pruned.npz'),ket=mu_ket_3d_masked,bra=mu_bra_3d_masked)
+            np.savez_compressed(os.path.join(dirname,'mu_pruned.npz'),ket=mu_ket_3d_masked,bra=mu_bra_3d_masked)
 
         else:
-            np.savez(os.path.join(dirname,'mu.npz'),ket=mu_ket_3d,bra=mu_bra_3d)
+            np.savez_compressed(os.path.join(dirname,'mu.npz'),ket=mu_ket_3d,bra=mu_bra_3d)
             np.savez(os.path.join(dirname,'eigenvalues.npz'),all_manifolds=self.eigenvalues)
             np.savez(os.path.join(dirname,'right_eigenvectors.npz'),all_manifolds=ev)
             np.savez(os.path.join(dirname,'left_eigenvectors.npz'),all_manifolds=evl)
@@ -618,70 +1106,51 @@ class OpenPolymer(Polymer,LiouvillianConstructor):
         evl = self.eigenvectors['left']
         ev = self.eigenvectors['right']
         
-        II = np.eye(self.mu_ket_up.shape[0])
-
-        mu_ket_up = np.kron(self.mu_ket_up,II.T)
-        mu_ket_down = np.kron(self.mu_ket_up.T,II.T)
-        mu_bra_up = np.kron(II,self.mu_ket_up)
-        mu_bra_down = np.kron(II,self.mu_ket_up.T)
-
         mu_mask_tol = 10
         
-        mu_ket_up_t = np.dot(np.dot(evl,mu_ket_up),ev)
-        mu_ket_up_3d = np.zeros((mu_ket_up_t.shape[0],mu_ket_up_t.shape[0],3),dtype='complex')
-        mu_ket_up_3d[:,:,0] = mu_ket_up_t
+        mu_ket_up_3d = self.eigenbasis_transform(evl,self.ket_superoperator_dot(self.mu_ket_up,ev))
+        mu_ket_up_t = mu_ket_up_3d[:,:,0]
 
-        mu_bra_up_t = np.dot(np.dot(evl,mu_bra_up),ev)
-        mu_bra_up_3d = np.zeros((mu_bra_up_t.shape[0],mu_bra_up_t.shape[0],3),dtype='complex')
-        mu_bra_up_3d[:,:,0] = mu_bra_up_t
+        mu_bra_up_3d = self.eigenbasis_transform(evl,self.bra_superoperator_dot(self.mu_ket_up.T,ev))
+        mu_bra_up_t = mu_bra_up_3d[:,:,0]
 
-        mu_ket_down_t = np.dot(np.dot(evl,mu_ket_down),ev)
-        mu_ket_down_3d = np.zeros((mu_ket_down_t.shape[0],mu_ket_down_t.shape[0],3),dtype='complex')
-        mu_ket_down_3d[:,:,0] = mu_ket_down_t
+        mu_ket_down_3d = self.eigenbasis_transform(evl,self.ket_superoperator_dot(self.mu_ket_up.T,ev))
+        mu_ket_down_t = mu_ket_down_3d[:,:,0]
 
-        mu_bra_down_t = np.dot(np.dot(evl,mu_bra_down),ev)
-        mu_bra_down_3d = np.zeros((mu_bra_down_t.shape[0],mu_bra_down_t.shape[0],3),dtype='complex')
-        mu_bra_down_3d[:,:,0] = mu_bra_down_t
+        mu_bra_down_3d = self.eigenbasis_transform(evl,self.bra_superoperator_dot(self.mu_ket_up,ev))
+        mu_bra_down_t = mu_bra_down_3d[:,:,0]
 
         if mask:
-            ket_up_mask = np.zeros(mu_ket_up_t.shape,dtype='bool')
-            ket_up_mask[:,:] = np.round(mu_ket_up_t,mu_mask_tol)[:,:]
-            mu_ket_up_t_masked = mu_ket_up_t * ket_up_mask
-            mu_ket_up_3d_masked = np.zeros((mu_ket_up_t.shape[0],mu_ket_up_t.shape[0],3),dtype='complex')
-            mu_ket_up_3d_masked[:,:,0] = mu_ket_up_t_masked
-
-            bra_up_mask = np.zeros(mu_bra_up_t.shape,dtype='bool')
-            bra_up_mask[:,:] = np.round(mu_bra_up_t,mu_mask_tol)[:,:]
-            mu_bra_up_t_masked = mu_bra_up_t * bra_up_mask
-            mu_bra_up_3d_masked = np.zeros((mu_ket_up_t.shape[0],mu_ket_up_t.shape[0],3),dtype='complex')
-            mu_bra_up_3d_masked[:,:,0] = mu_bra_up_t_masked
-
-            ket_down_mask = np.zeros(mu_ket_down_t.shape,dtype='bool')
-            ket_down_mask[:,:] = np.round(mu_ket_down_t,mu_mask_tol)[:,:]
-            mu_ket_down_t_masked = mu_ket_down_t * ket_down_mask
-            mu_ket_down_3d_masked = np.zeros((mu_ket_down_t.shape[0],mu_ket_down_t.shape[0],3),dtype='complex')
-            mu_ket_down_3d_masked[:,:,0] = mu_ket_down_t_masked
-
-            bra_down_mask = np.zeros(mu_bra_down_t.shape,dtype='bool')
-            bra_down_mask[:,:] = np.round(mu_bra_down_t,mu_mask_tol)[:,:]
-            mu_bra_down_t_masked = mu_bra_down_t * bra_down_mask
-            mu_bra_down_3d_masked = np.zeros((mu_ket_down_t.shape[0],mu_ket_down_t.shape[0],3),dtype='complex')
-            mu_bra_down_3d_masked[:,:,0] = mu_bra_down_t_masked
-
-            np.savez(os.path.join(dirname,'mu.npz'),ket_up=mu_ket_up_3d,bra_up=mu_bra_up_3d,
-                     ket_down=mu_ket_down_3d,bra_down=mu_bra_down_3d)
+            ket_up_mask = self.dipole_mask(mu_ket_up_t,mu_mask_tol)
+            mu_ket_up_3d_masked = np.zeros(mu_ket_up_3d.shape,dtype=mu_ket_up_3d.dtype,order='F')
+            np.copyto(mu_ket_up_3d_masked[:,:,0],mu_ket_up_t,where=ket_up_mask)
+
+            bra_up_mask = self.dipole_mask(mu_bra_up_t,mu_mask_tol)
+            mu_bra_up_3d_masked = np.zeros(mu_bra_up_3d.shape,dtype=mu_bra_up_3d.dtype,order='F')
+            np.copyto(mu_bra_up_3d_masked[:,:,0],mu_bra_up_t,where=bra_up_mask)
+
+            ket_down_mask = self.dipole_mask(mu_ket_down_t,mu_mask_tol)
+            mu_ket_down_3d_masked = np.zeros(mu_ket_down_3d.shape,dtype=mu_ket_down_3d.dtype,order='F')
+            np.copyto(mu_ket_down_3d_masked[:,:,0],mu_ket_down_t,where=ket_down_mask)
+
+            bra_down_mask = self.dipole_mask(mu_bra_down_t,mu_mask_tol)
+            mu_bra_down_3d_masked = np.zeros(mu_bra_down_3d.shape,dtype=mu_bra_down_3d.dtype,order='F')
+            np.copyto(mu_bra_down_3d_masked[:,:,0],mu_bra_down_t,where=bra_down_mask)
+
+            np.savez_compressed(os.path.join(dirname,'mu.npz'),ket_up=mu_ket_up_3d,bra_up=mu_bra_up_3d,
+                                ket_down=mu_ket_down_3d,bra_down=mu_bra_down_3d)
             np.savez(os.path.join(dirname,'eigenvalues.npz'),all_manifolds=self.eigenvalues)
             np.savez(os.path.join(dirname,'right_eigenvectors.npz'),all_manifolds=ev)
             np.savez(os.path.join(dirname,'left_eigenvectors.npz'),all_manifolds=evl)
             np.savez(os.path.join(dirname,'mu_boolean.npz'),ket_up=ket_up_mask,bra_up=bra_up_mask,
                      ket_down=ket_down_mask,bra_down=bra_down_mask)
-            np.savez(os.path.join(dirname,'mu_pruned.npz'),ket_up=mu_ket_up_3d_masked,
-                     bra_up=mu_bra_up_3d_masked,ket_down=mu_ket_down_3d_masked,
-                     bra_down=mu_bra_down_3d_masked)
+            np.savez_compressed(os.path.join(dirname,'mu_pruned.npz'),ket_up=mu_ket_up_3d_masked,
+                                bra_up=mu_bra_up_3d_masked,ket_down=mu_ket_down_3d_masked,
+                                bra_down=mu_bra_down_3d_masked)
 
         else:
-            np.savez(os.path.join(dirname,'mu.npz'),ket_up=mu_ket_up_3d,bra_up=mu_bra_up_3d,
-                     ket_down=mu_ket_down_3d,bra_down=mu_bra_down_3d)
+            np.savez_compressed(os.path.join(dirname,'mu.npz'),ket_up=mu_ket_up_3d,bra_up=mu_bra_up_3d,
+                                ket_down=mu_ket_down_3d,bra_down=mu_bra_down_3d)
             np.savez(os.path.join(dirname,'eigenvalues.npz'),all_manifolds=self.eigenvalues)
             np.savez(os.path.join(dirname,'right_eigenvectors.npz'),all_manifolds=ev)
             np.savez(os.path.join(dirname,'left_eigenvectors.npz'),all_manifolds=evl)
@@ -795,7 +1264,7 @@ for sites a, b, ...
         else:
             t0 = time.time()
             if self.manifolds_separable:
-                self.set_eigensystem_by_manifold(force_detailed_balance = force_detailed_balance)
+                self.set_eigensystem_by_manifold(force_detailed_balance = force_detailed_balance,free_L = True)
                 self.set_mu_by_manifold(H_eigentransform=H_eigentransform)
                 self.save_mu_by_manifold(pruned=True)
                 self.save_eigensystem_by_manifold()
@@ -820,14 +1289,30 @@ for sites a, b, ...
     def set_H_eigsystem_by_manifold(self):
         self.H_eigenvalues = []
         self.H_eigenvectors = []
-        for i in range(self.maximum_manifold+1):
-            e,v = np.linalg.eigh(self.extract_vibronic_manifold(self.total_hamiltonian,i))
-            for i in range(e.size):
-                max_ind = np.argmax(np.abs(v[:,i]))
-                if v[max_ind,i] < 0:
-                    v[:,i] = v[:,i] * -1
+        self.electronic_site_weights_by_manifold = dict()
+        self.eigenstate_boltzmann_factors_by_manifold = dict()
+        num_manifolds = self.maximum_manifold+1
+        # A Hamiltonian that was cast to complex but is real-symmetric is
+        # diagonalized as real, so that V and every V.T.dot(O.dot(V))
+        # transform built from it stay real
+        blocks = [self.real_if_negligible_imag(self.extract_vibronic_manifold(self.total_hamiltonian,i),atol=0)
+                  for i in range(num_manifolds)]
+        def f(h):
+            return eigh(h,driver='evr',check_finite=False)
+        # The manifolds are independent, and LAPACK releases the GIL, so
+        # the diagonalizations are run on a thread pool
+        max_workers = min(num_manifolds,os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(f,blocks))
+        for e,v in results:
+            # Make the largest element of each eigenvector positive
+            max_inds = np.argmax(np.abs(v),axis=0)
+            pivots = v[max_inds,np.arange(v.shape[1])]
+            v *= np.where(pivots < 0,-1,1)
             self.H_eigenvalues.append(e)
             self.H_eigenvectors.append(v)
+        # |v|**2 is shared by all of the relaxation rate calculations
+        self.H_eigenvector_weights = [np.abs(v)**2 for v in self.H_eigenvectors]
 
     def save_rho0(self,*,H_eigentransform=False):
         H_size = self.H_eigenvalues[0].size
@@ -854,11 +1339,14 @@ for sites a, b, ...
             
 
     def eigfun2(self,ket_manifold_num,bra_manifold_num,*,check_eigenvectors = True):
-        key = str(ket_manifold_num) + str(bra_manifold_num)
-        L = self.L_by_manifold[key]
+        """Returns E, V, VL with V and VL as sparse csr matrices.  Outside
+            of the population subspace the eigenvectors are the Liouville 
+            space basis vectors themselves, so only the population block is
+            dense
+"""
+        L = self.L_by_manifold[ket_manifold_num,bra_manifold_num]
         E = L.diagonal().copy()
-        V = np.eye(E.size,dtype='complex')
-        VL = V.copy()
+        n = E.size
         
         if ket_manifold_num == bra_manifold_num:
             size = self.H_eigenvalues[ket_manifold_num].size
@@ -867,19 +1355,18 @@ for sites a, b, ...
             L_pop = L_pop[:,pop_inds]
             e, v, vl = self.eigfun(L_pop,populations_only=True)
             E[pop_inds] = e[:]
-            for i,j in zip(pop_inds,range(len(pop_inds))):
-                
-                V[pop_inds,i] = v[:,j]
-                
-                VL[pop_inds,i] = vl[:,j]
+            other_inds = np.setdiff1d(np.arange(n),pop_inds,assume_unique=True)
+            rows = np.concatenate([other_inds,np.repeat(pop_inds,size)])
+            cols = np.concatenate([other_inds,np.tile(pop_inds,size)])
+            ones = np.ones(other_inds.size,dtype='complex')
+            V = csr_matrix((np.concatenate([ones,v.ravel()]),(rows,cols)),shape=(n,n),dtype='complex')
+            VL = csr_matrix((np.concatenate([ones,vl.ravel()]),(rows,cols)),shape=(n,n),dtype='complex')
+        else:
+            V = identity(n,dtype='complex',format='csr')
+            VL = identity(n,dtype='complex',format='csr')
 
         if check_eigenvectors:
-            LV = L.dot(V)
-            D = VL.dot(LV)
-            if np.allclose(D,np.diag(E),rtol=1E-10,atol=1E-10):
-                pass
-            else:
-                warnings.warn('Using eigenvectors to diagonalize Liouvillian does not result in the expected diagonal matrix to tolerance, largest deviation is {}'.format(np.max(np.abs(D - np.diag(E)))))
+            self.check_diagonalization(L,E,V,VL)
 
         self.eigenvalues = E
         self.eigenvectors = {'left':VL,'right':V}
@@ -887,6 +1374,15 @@ for sites a, b, ...
         return E,V,VL
 
     def vibrational_occupation_to_indices(self,vibration,occ_num,manifold_num):
+        """Results are cached by (vibration, occ_num, manifold_num)
+"""
+        key = (vibration,occ_num,manifold_num)
+        try:
+            return self.vibrational_occupation_indices[key]
+        except AttributeError:
+            self.vibrational_occupation_indices = dict()
+        except KeyError:
+            pass
         single_mode_occ = np.arange(self.truncation_size)
         vib_occ = self.vibrational_vector_of_ones_kron(vibration,single_mode_occ)
         masked_single_mode_occ = vib_occ[self.vibrational_mask]
@@ -894,63 +1390,112 @@ for sites a, b, ...
         electronic_manifold_hamiltonian = self.get_electronic_hamiltonian(manifold_num = manifold_num)
         elec_size = electronic_manifold_hamiltonian.shape[0]
         
-        masked_single_mode_occ = np.kron(np.ones(elec_size),masked_single_mode_occ)
-        return np.where(masked_single_mode_occ == occ_num)[0]
+        masked_single_mode_occ = np.tile(masked_single_mode_occ,elec_size)
+        inds = np.where(masked_single_mode_occ == occ_num)[0]
+        self.vibrational_occupation_indices[key] = inds
+        return inds
 
     def electronic_occupation_to_indices(self,site_num,manifold_num):
+        """Results are cached by (site_num, manifold_num)
+"""
+        key = (site_num,manifold_num)
+        try:
+            return self.electronic_occupation_indices[key]
+        except AttributeError:
+            self.electronic_occupation_indices = dict()
+        except KeyError:
+            pass
         single_mode_occ = np.arange(2)
         elec_occ = self.electronic_vector_of_ones_kron(site_num,single_mode_occ)
         mask = self.electronic_manifold_mask(manifold_num)
         masked_elec_occ = elec_occ[mask]
-        masked_elec_occ = np.kron(masked_elec_occ,np.ones(self.vibrational_mask[0].size))
+        masked_elec_occ = np.repeat(masked_elec_occ,self.vibrational_mask[0].size)
 
-        return np.where(masked_elec_occ == 1)[0]
+        inds = np.where(masked_elec_occ == 1)[0]
+        self.electronic_occupation_indices[key] = inds
+        return inds
 
-    def get_vibrational_relaxation_rates(self,manifold_num):
-        e = self.H_eigenvalues[manifold_num]
-        rates = np.zeros((e.size,e.size))
-        for i in range(e.size):
-            for j in range(e.size):
-                for n in range(self.num_vibrations):
-                    if j > i:
-                        rates[i,j] += self.single_vibrational_relaxation_rate(i,j,n,manifold_num)
-        return rates
-    
-    def single_vibrational_relaxation_rate(self,i,j,vibration,manifold_num):
-        vi = self.H_eigenvectors[manifold_num][:,i]
-        vj = self.H_eigenvectors[manifold_num][:,j]
-        rate = 0
+    def vibrational_raising_index_pairs(self,vibration,manifold_num):
+        """Returns the index arrays k_inds and kp1_inds, and the weights 
+            sqrt(k+1), of all of the basis state pairs that enter 
+            single_vibrational_relaxation_rate, concatenated over k
+"""
+        all_k_inds = []
+        all_kp1_inds = []
+        all_weights = []
         for k in range(self.truncation_size):
             k_inds = self.vibrational_occupation_to_indices(vibration,k,manifold_num)
             kp1_inds = self.vibrational_occupation_to_indices(vibration,k+1,manifold_num)
-            for k_ind,kp1_ind in zip(k_inds,kp1_inds):
-                rate = rate + np.abs(vi[k_ind])**2 * np.abs(vj[kp1_ind])**2*np.sqrt(k+1)
-        return rate
+            # Pairs are matched in order, as zip does
+            num_pairs = min(k_inds.size,kp1_inds.size)
+            all_k_inds.append(k_inds[:num_pairs])
+            all_kp1_inds.append(kp1_inds[:num_pairs])
+            all_weights.append(np.full(num_pairs,np.sqrt(k+1)))
+        return np.concatenate(all_k_inds), np.concatenate(all_kp1_inds), np.concatenate(all_weights)
+
+    def eigenstate_boltzmann_factors(self,manifold_num,i,j):
+        """Returns boltzmann_factors(E[i],E[j]) for the H eigenvalues E of the
+            given manifold, for index arrays i and j.  The factors for all 
+            pairs of eigenstates are computed once per manifold, using one 
+            exponential per eigenstate, and cached until the H eigensystem
+            is reset
+"""
+        try:
+            down, up = self.eigenstate_boltzmann_factors_by_manifold[manifold_num]
+        except KeyError:
+            E = self.H_eigenvalues[manifold_num]
+            down, up = self.boltzmann_factors_array(E[:,np.newaxis],E[np.newaxis,:])
+            self.eigenstate_boltzmann_factors_by_manifold[manifold_num] = (down,up)
+        return down[i,j], up[i,j]
+
+    def get_vibrational_relaxation_rates(self,manifold_num):
+        """Computes single_vibrational_relaxation_rate for all pairs j > i at
+            once, as one matrix product per vibration
+"""
+        P = self.H_eigenvector_weights[manifold_num]
+        rates = np.zeros((P.shape[1],P.shape[1]))
+        for n in range(self.num_vibrations):
+            k_inds, kp1_inds, weights = self.vibrational_raising_index_pairs(n,manifold_num)
+            rates += P[k_inds,:].T.dot(weights[:,np.newaxis] * P[kp1_inds,:])
+        return np.triu(rates,1)
+    
+    def single_vibrational_relaxation_rate(self,i,j,vibration,manifold_num):
+        P = self.H_eigenvector_weights[manifold_num]
+        k_inds, kp1_inds, weights = self.vibrational_raising_index_pairs(vibration,manifold_num)
+        return np.dot(weights,P[k_inds,i]*P[kp1_inds,j])
 
     def get_electronic_relaxation_rates(self,a,b,manifold_num):
-        e = self.H_eigenvalues[manifold_num]
-        rates = np.zeros((e.size,e.size))
-        for i in range(e.size):
-            for j in range(e.size):
-                if j > i:
-                    rates[i,j] += self.single_electronic_relaxation_rate(i,j,a,b,manifold_num)
-        return rates
+        S = self.electronic_site_weights(manifold_num)
+        rates = np.outer(S[a,:],S[b,:])
+        return np.triu(rates,1)
+
+    def electronic_site_weights(self,manifold_num):
+        """Returns S, where S[a,i] is the total weight of eigenstate i of the 
+            given manifold on states with site a occupied.  Cached per manifold
+            until the H eigensystem is reset
+"""
+        try:
+            return self.electronic_site_weights_by_manifold[manifold_num]
+        except KeyError:
+            pass
+        P = self.H_eigenvector_weights[manifold_num]
+        S = np.zeros((len(self.energies),P.shape[1]))
+        for a in range(len(self.energies)):
+            a_inds = self.electronic_occupation_to_indices(a,manifold_num)
+            S[a,:] = np.sum(P[a_inds,:],axis=0)
+        self.electronic_site_weights_by_manifold[manifold_num] = S
+        return S
 
     def get_all_electronic_relaxation_rates(self,manifold_num):
-        """Treats all sites as having the same relaxation rates
-"""
-        e = self.H_eigenvalues[manifold_num]
-        rates = np.zeros((e.size,e.size))
-        for i in range(e.size):
-            for j in range(e.size):
-                if j > i:
-                    for a in range(len(self.energies)):
-                        Ea = self.energies[a]
-                        for b in range(len(self.energies)):
-                            Eb = self.energies[b]
-                            if Eb > Ea:
-                                rates[i,j] += self.single_electronic_relaxation_rate(i,j,a,b,manifold_num)
-        return rates
+        """Treats all sites as having the same relaxation rates.  Sums 
+            single_electronic_relaxation_rate over all site pairs with Eb > Ea,
+            for all j > i, as a single contraction
+"""
+        S = self.electronic_site_weights(manifold_num)
+        energies = np.array(self.energies)
+        site_mask = (energies[np.newaxis,:] > energies[:,np.newaxis]).astype('float')
+        rates = np.einsum('ai,ab,bj->ij',S,site_mask,S)
+        return np.triu(rates,1)
 
     def get_all_relaxation_rates(self,manifold_num):
         rates = self.vibrational_gamma * self.get_vibrational_relaxation_rates(manifold_num)
@@ -959,151 +1504,138 @@ for sites a, b, ...
 
     def all_eigenstate_relaxation_instructions_by_manifold(self,manifold_num):
         rates = self.get_all_relaxation_rates(manifold_num)
-        E = self.H_eigenvalues[manifold_num]
         ins = []
-        for i in range(rates.shape[0]):
-            for j in range(rates.shape[1]):
-                if j > i:
-                    O = np.zeros(rates.shape)
-                    O[i,j] = 1
-                    down, up = self.boltzmann_factors(E[i],E[j])
-                    down = down * rates[i,j]
-                    up = up * rates[i,j]
-                    ins += self.make_Lindblad_instructions(down,O)
-                    if np.isclose(up,0):
-                        pass
-                    else:
-                        ins += self.make_Lindblad_instructions(up,O.T)
+        i_inds, j_inds = np.triu_indices(rates.shape[0],1)
+        down_all, up_all = self.eigenstate_boltzmann_factors(manifold_num,i_inds,j_inds)
+        down_all = down_all * rates[i_inds,j_inds]
+        up_all = up_all * rates[i_inds,j_inds]
+        size = rates.shape[0]
+        for i, j, down, up in zip(i_inds,j_inds,down_all,up_all):
+            ins += self.make_transition_Lindblad_instructions(down,i,j,size)
+            if np.isclose(up,0):
+                pass
+            else:
+                ins += self.make_transition_Lindblad_instructions(up,j,i,size)
         return ins
 
     def all_eigenstate_relaxation_instructions_by_coherence(self,ket_manifold_num,bra_manifold_num):
         if ket_manifold_num == bra_manifold_num:
             return self.all_eigenstate_relaxation_instructions_by_manifold(ket_manifold_num)
         ket_rates = self.get_all_relaxation_rates(ket_manifold_num)
-        E_ket = self.H_eigenvalues[ket_manifold_num]
         bra_rates = self.get_all_relaxation_rates(bra_manifold_num)
-        E_bra = self.H_eigenvalues[bra_manifold_num]
         ins = []
-        Obra = np.zeros(bra_rates.shape)
-        for i in range(ket_rates.shape[0]):
-            for j in range(ket_rates.shape[1]):
-                if j > i:
-                    Oket = np.zeros(ket_rates.shape)
-                    Oket[i,j] = 1
-                    down,up = self.boltzmann_factors(E_ket[i],E_ket[j])
-                    down = down * ket_rates[i,j]
-                    up = up * ket_rates[i,j]
-                        
-                    ins += self.make_Lindblad_instructions2_Obra0(down,Oket,Obra)
-
-                    if np.isclose(up,0):
-                        pass
-                    else:
-                        ins += self.make_Lindblad_instructions2_Obra0(up,Oket.T,Obra)
-
-        Oket = np.zeros(ket_rates.shape)
-        for i in range(bra_rates.shape[0]):
-            for j in range(bra_rates.shape[1]):
-                if j > i:
-                    Obra = np.zeros(bra_rates.shape)
-                    Obra[i,j] = 1
-                    down,up = self.boltzmann_factors(E_bra[i],E_bra[j])
-                    down = down * bra_rates[i,j]
-                    up = up * bra_rates[i,j]
-                        
-                    ins += self.make_Lindblad_instructions2_Oket0(down,Oket,Obra)
-
-                    if np.isclose(up,0):
-                        pass
-                    else:
-                        ins += self.make_Lindblad_instructions2_Oket0(up,Oket,Obra.T)
+        ket_size = ket_rates.shape[0]
+        bra_size = bra_rates.shape[0]
+        i_inds, j_inds = np.triu_indices(ket_size,1)
+        down_all, up_all = self.eigenstate_boltzmann_factors(ket_manifold_num,i_inds,j_inds)
+        down_all = down_all * ket_rates[i_inds,j_inds]
+        up_all = up_all * ket_rates[i_inds,j_inds]
+        for i, j, down, up in zip(i_inds,j_inds,down_all,up_all):
+            ins += self.make_transition_Lindblad_instructions2_Obra0(down,i,j,ket_size,bra_size)
+
+            if np.isclose(up,0):
+                pass
+            else:
+                ins += self.make_transition_Lindblad_instructions2_Obra0(up,j,i,ket_size,bra_size)
+
+        i_inds, j_inds = np.triu_indices(bra_size,1)
+        down_all, up_all = self.eigenstate_boltzmann_factors(bra_manifold_num,i_inds,j_inds)
+        down_all = down_all * bra_rates[i_inds,j_inds]
+        up_all = up_all * bra_rates[i_inds,j_inds]
+        for i, j, down, up in zip(i_inds,j_inds,down_all,up_all):
+            ins += self.make_transition_Lindblad_instructions2_Oket0(down,i,j,ket_size,bra_size)
+
+            if np.isclose(up,0):
+                pass
+            else:
+                ins += self.make_transition_Lindblad_instructions2_Oket0(up,j,i,ket_size,bra_size)
         return ins
                             
     def single_electronic_relaxation_rate(self,i,j,a,b,manifold_num):
-        vi = self.H_eigenvectors[manifold_num][:,i]
-        vj = self.H_eigenvectors[manifold_num][:,j]
-        a_inds = self.electronic_occupation_to_indices(a,manifold_num)
-        b_inds = self.electronic_occupation_to_indices(b,manifold_num)
-        rate = np.sum(np.abs(vi[a_inds])**2) * np.sum(np.abs(vj[b_inds])**2)
+        S = self.electronic_site_weights(manifold_num)
+        rate = S[a,i] * S[b,j]
 
         return rate
 
     def make_eigenstate_relaxation_Lindblad_all_rates(self,rates,manifold_num):
-        """From j to i. Factor of 0.5 matches my previous definition of Lindblad formalism"""
+        """From j to i. Factor of 0.5 matches my previous definition of Lindblad formalism.
+            Returned as a csr_matrix: the Liouvillian is diagonal, apart from
+            the block coupling the populations to each other
+"""
         E = self.H_eigenvalues[manifold_num]
         size = E.size
         pop_inds = np.arange(size)*(size+1)
         pop_subspace = np.zeros((pop_inds.size,pop_inds.size))
-        L_diagonal = np.zeros((size,size))
-        
-        for i in range(size):
-            for j in range(size):
-                if j > i:
-                    down,up = self.boltzmann_factors(E[i],E[j])
-                    down = down * rates[i,j]
-                    up = up * rates[i,j]
-
-                    pop_subspace[j,j] += -0.5*down
-                    pop_subspace[i,j] += 0.5*down
-                    pop_subspace[i,i] += -0.5*up
-                    pop_subspace[j,i] += 0.5*up
-
-                    L_diagonal[j,:] += -0.25*down
-                    L_diagonal[:,j] += -0.25*down
-                    L_diagonal[j,j] += -0.5*down
-
-                    L_diagonal[i,:] += -0.25*up
-                    L_diagonal[:,i] += -0.25*up
-                    L_diagonal[i,i] += -0.5*up
-                    
-        L_total = np.diag(L_diagonal.ravel())
-        for i,j in zip(pop_inds,np.arange(pop_inds.size)):
-            L_total[i,pop_inds] = pop_subspace[j,:]
+
+        i, j = np.triu_indices(size,1)
+        down,up = self.eigenstate_boltzmann_factors(manifold_num,i,j)
+        down = down * rates[i,j]
+        up = up * rates[i,j]
+
+        # Total rate out of each state, summed with bincount
+        out_rates = np.bincount(j,weights=down,minlength=size) + np.bincount(i,weights=up,minlength=size)
+
+        # Each (i,j) pair with j > i appears once, so the transfer terms
+        # are assigned directly
+        pop_subspace[i,j] = 0.5*down
+        pop_subspace[j,i] = 0.5*up
+        pop_subspace[np.arange(size),np.arange(size)] = -0.5*out_rates
+
+        # Each rate contributes to a full row and a full column of L_diagonal
+        L_row = -0.25*out_rates
+        L_diagonal = L_row[:,np.newaxis] + L_row[np.newaxis,:] + np.diag(2*L_row)
+
+        # The population rows are replaced by the population subspace
+        coherence_mask = np.ones(size**2,dtype='bool')
+        coherence_mask[pop_inds] = False
+        coherence_inds = np.flatnonzero(coherence_mask)
+        rows = np.concatenate((coherence_inds,np.repeat(pop_inds,size)))
+        cols = np.concatenate((coherence_inds,np.tile(pop_inds,size)))
+        data = np.concatenate((L_diagonal.ravel()[coherence_mask],pop_subspace.ravel()))
+        L_total = csr_matrix((data,(rows,cols)),shape=(size**2,size**2))
+        L_total.eliminate_zeros()
 
         return L_total
 
     def make_eigenstate_relaxation_Lindblad_all_rates_by_coherence(self,ket_rates,bra_rates,ket_manifold_num,bra_manifold_num):
-        """From j to i. Factor of 0.5 matches my previous definition of Lindblad formalism"""
+        """From j to i. Factor of 0.5 matches my previous definition of Lindblad formalism.
+            Returned as a diagonal csr_matrix
+"""
         if ket_manifold_num == bra_manifold_num:
             return self.make_eigenstate_relaxation_Lindblad_all_rates(ket_rates,ket_manifold_num)
         E_ket = self.H_eigenvalues[ket_manifold_num]
         E_bra = self.H_eigenvalues[bra_manifold_num]
         ket_size = E_ket.size
         bra_size = E_bra.size
-        L_diagonal = np.zeros((ket_size,bra_size))
-        
-        for i in range(ket_size):
-            for j in range(ket_size):
-                if j > i:
-                    down,up = self.boltzmann_factors(E_ket[i],E_ket[j])
-                    down = down * ket_rates[i,j]
-                    up = up * ket_rates[i,j]
-
-                    L_diagonal[j,:] += -0.25*down
-                    L_diagonal[i,:] += -0.25*up
-
-        for i in range(bra_size):
-            for j in range(bra_size):
-                if j > i:
-                    down,up = self.boltzmann_factors(E_bra[i],E_bra[j])
-                    down = down * bra_rates[i,j]
-                    down = down * bra_rates[i,j]
-
-                    L_diagonal[:,j] += -0.25*down
-                    L_diagonal[:,i] += -0.25*up
-                    
-        L_total = np.diag(L_diagonal.ravel())
+
+        i, j = np.triu_indices(ket_size,1)
+        down,up = self.eigenstate_boltzmann_factors(ket_manifold_num,i,j)
+        down = down * ket_rates[i,j]
+        up = up * ket_rates[i,j]
+        L_ket = -0.25*(np.bincount(j,weights=down,minlength=ket_size) + np.bincount(i,weights=up,minlength=ket_size))
+
+        i, j = np.triu_indices(bra_size,1)
+        down,up = self.eigenstate_boltzmann_factors(bra_manifold_num,i,j)
+        down = down * bra_rates[i,j]
+        down = down * bra_rates[i,j]
+        L_bra = -0.25*(np.bincount(j,weights=down,minlength=bra_size) + np.bincount(i,weights=up,minlength=bra_size))
+
+        L_diagonal = L_ket[:,np.newaxis] + L_bra[np.newaxis,:]
+        L_total = diags(L_diagonal.ravel(),format='csr')
+        L_total.eliminate_zeros()
 
         return L_total
 
     def add_eigenstate_relaxation_effects(self):
+        all_rates = [self.get_all_relaxation_rates(k) for k in range(self.maximum_manifold+1)]
         for k in range(self.maximum_manifold+1):
-            rates_k = self.get_all_relaxation_rates(k)
+            rates_k = all_rates[k]
             for l in range(self.maximum_manifold+1):
-                rates_l = self.get_all_relaxation_rates(l)
-                key = str(k) + str(l)
+                rates_l = all_rates[l]
+                key = (k,l)
                 L = self.L_by_manifold[key]
-                L += self.make_eigenstate_relaxation_Lindblad_all_rates_by_coherence(rates_k,rates_l,k,l)
+                L = L + self.make_eigenstate_relaxation_Lindblad_all_rates_by_coherence(rates_k,rates_l,k,l)
+                self.L_by_manifold[key] = csr_matrix(L)
 
     def add_eigenstate_optical_dephasing_effects(self):
         for k in range(self.maximum_manifold+1):
@@ -1111,9 +1643,10 @@ for sites a, b, ...
                 if k == l:
                     pass
                 else:
-                    key = str(k) + str(l)
+                    key = (k,l)
                     L = self.L_by_manifold[key]
-                    L += self.make_eigenstate_optical_dephasing_Lindblad(k,l)
+                    L = L + self.make_eigenstate_optical_dephasing_Lindblad(k,l)
+                    self.L_by_manifold[key] = csr_matrix(L)
 
     def make_eigenstate_relaxation_Lindblad(self,gamma,i,j,manifold_num):
         """From j to i. Factor of 0.5 matches my previous definition of Lindblad formalism"""
@@ -1153,7 +1686,7 @@ for sites a, b, ...
 createe the dephasing Lindblad for the electronic space only, and use it to 
 fill in a single rate on the diagonal of the Liouvillian.  The trick is to get
 dephasing between the nth and n+kth manifold right, when k > 1 (k = 1 is simply 
-gamma)"""
+gamma).  Returned as a diagonal csr_matrix"""
         opt_deph = self.optical_dephasing_Liouvillian().diagonal().reshape(self.electronic_hamiltonian.shape)
         
         opt_deph = self.extract_coherence(opt_deph,ket_manifold_num,bra_manifold_num).ravel()
@@ -1166,9 +1699,9 @@ gamma)"""
         ket_size = self.H_eigenvalues[ket_manifold_num].size
         bra_size = self.H_eigenvalues[bra_manifold_num].size
 
-        opt_deph = np.ones((ket_size,bra_size),dtype='complex') * opt_deph[0]
+        opt_deph = np.full(ket_size*bra_size,opt_deph[0],dtype='complex')
 
-        return np.diag(opt_deph.ravel())
+        return diags(opt_deph,format='csr')
 
     def set_bath_coupling(self):
         try:
@@ -1206,6 +1739,7 @@ gamma)"""
 
     def convert_electronic_instructions_to_full_instructions(self,inst_list):
         new_inst_list = []
+        vib_identity = identity(self.vibrational_identity.shape[0],format='csr')
         for ins in inst_list:
             left,right = ins
             if self.manifolds_separable == True:
@@ -1213,35 +1747,66 @@ gamma)"""
             else:
                 left = self.extract_electronic_subspace(left,0,self.maximum_manifold)
                 right = self.extract_electronic_subspace(right,0,self.maximum_manifold)
-            left = np.kron(left,self.vibrational_identity)
-            right = np.kron(right,self.vibrational_identity)
+            # kron with the vibrational identity is block diagonal, so it
+            # is stored sparsely
+            left = kron(csr_matrix(left),vib_identity,format='csr')
+            right = kron(csr_matrix(right),vib_identity,format='csr')
             new_inst_list.append((left,right))
         return new_inst_list
 
     def vibronic_manifold_mask(self,manifold_num):
         """Gets the indices of the Hilbert space that occupy a particular electronic
-            manifold, including all vibrational degrees of freedom from that manifold
+            manifold, including all vibrational degrees of freedom from that manifold.
+            Results are cached by manifold_num
 """
+        try:
+            return self.vibronic_manifold_indices[manifold_num]
+        except AttributeError:
+            self.vibronic_manifold_indices = dict()
+        except KeyError:
+            pass
         try:
             vib_size = self.vibrational_mask[0].size
         except AttributeError:
             N = self.truncation_size
             nv = self.num_vibrations
             vib_size = N**nv
-        vib_ones = np.ones(vib_size,dtype='int')
-        vibronic_occupation_number = np.kron(self.electronic_total_occupation_number,vib_ones)
+        vibronic_occupation_number = np.repeat(self.electronic_total_occupation_number,vib_size)
         manifold_inds = np.where(vibronic_occupation_number == manifold_num)[0]
+        self.vibronic_manifold_indices[manifold_num] = manifold_inds
         return manifold_inds
 
+    def vibronic_manifold_slice(self,manifold_num):
+        """Returns a slice selecting the given manifold if its indices are 
+            contiguous, and None otherwise.  Results are cached by manifold_num
+"""
+        try:
+            return self.vibronic_manifold_slices[manifold_num]
+        except AttributeError:
+            self.vibronic_manifold_slices = dict()
+        except KeyError:
+            pass
+        inds = self.vibronic_manifold_mask(manifold_num)
+        if inds.size and inds[-1] - inds[0] == inds.size - 1:
+            manifold_slice = slice(inds[0],inds[-1]+1)
+        else:
+            manifold_slice = None
+        self.vibronic_manifold_slices[manifold_num] = manifold_slice
+        return manifold_slice
+
     def extract_vibronic_coherence(self,O,manifold1,manifold2):
         """Returns result of projecting the Operator O onto manifold1
-            on the left and manifold2 on the right
+            on the left and manifold2 on the right.  When both manifolds
+            are contiguous blocks of the Hilbert space the result is a 
+            view of O
 """
+        slice1 = self.vibronic_manifold_slice(manifold1)
+        slice2 = self.vibronic_manifold_slice(manifold2)
+        if slice1 is not None and slice2 is not None:
+            return O[slice1,slice2]
         manifold1_inds = self.vibronic_manifold_mask(manifold1)
         manifold2_inds = self.vibronic_manifold_mask(manifold2)
-        O = O[manifold1_inds,:]
-        O = O[:,manifold2_inds]
-        return O
+        return O[np.ix_(manifold1_inds,manifold2_inds)]
     
     def extract_vibronic_manifold(self,O,manifold_num):
         """Projects operator into the given electronic excitation manifold
@@ -1249,7 +1814,7 @@ gamma)"""
         return self.extract_vibronic_coherence(O,manifold_num,manifold_num)
 
     def set_L(self):
-        self.L = self.make_Liouvillian(self.all_instructions)
+        self.L = self.make_Liouvillian_operator(self.all_instructions)
 
     def set_eigensystem(self):
         self.eigfun(self.L)
@@ -1258,28 +1823,77 @@ gamma)"""
         all_inst = self.all_instructions
         
         self.L_by_manifold = dict()
+        # Shared by all coherences; keyed by id, so only valid while all_inst is
+        transform_cache = dict()
         for i in range(self.maximum_manifold+1):
             for j in range(self.maximum_manifold+1):
-                key = str(i) + str(j)
-                inst = self.extract_coherence_instructions_from_full_instructions(all_inst,i,j,H_eigentransform=H_eigentransform)
+                key = (i,j)
+                inst = self.extract_coherence_instructions_from_full_instructions(all_inst,i,j,H_eigentransform=H_eigentransform,
+                                                                                  transform_cache=transform_cache)
                 if add_eigenstate_relaxation_effects:
                     inst += self.all_eigenstate_relaxation_instructions_by_coherence(i,j)
                 self.L_by_manifold[key] = self.make_Liouvillian(inst)
 
-    def set_eigensystem_by_manifold(self,*,force_detailed_balance = False):
+    def set_eigensystem_by_manifold(self,*,force_detailed_balance = False,free_L = False):
+        """If free_L is True, each Liouvillian is removed from L_by_manifold 
+            once it has been diagonalized, so that the Liouvillians and all
+            of the eigenvectors are never held in memory at the same time
+"""
         self.right_eigenvectors_by_manifold = dict()
         self.left_eigenvectors_by_manifold = dict()
         self.eigenvalues_by_manifold = dict()
-        for i in range(self.maximum_manifold+1):
-            for j in range(self.maximum_manifold+1):
-                key = str(i) + str(j)
-                if force_detailed_balance:
-                    e, r, l = self.eigfun2(i,j,check_eigenvectors = False)
-                else:
-                    e, r, l = self.eigfun(self.L_by_manifold[key])
-                self.right_eigenvectors_by_manifold[key] = r
-                self.left_eigenvectors_by_manifold[key] = l
-                self.eigenvalues_by_manifold[key] = e
+        manifold_pairs = [(i,j) for i in range(self.maximum_manifold+1)
+                          for j in range(self.maximum_manifold+1)]
+        if force_detailed_balance:
+            for i,j in manifold_pairs:
+                self.store_eigensystem_by_manifold((i,j),*self.eigfun2(i,j,check_eigenvectors = False))
+                if free_L:
+                    del self.L_by_manifold[i,j]
+        else:
+            # The coherences are independent, and LAPACK releases the GIL, so
+            # the diagonalizations are run on a thread pool.  A popped L is
+            # only referenced by the pool until its eigfun call returns
+            if free_L:
+                Ls = (self.L_by_manifold.pop(key) for key in manifold_pairs)
+            else:
+                Ls = (self.L_by_manifold[key] for key in manifold_pairs)
+            def f(L):
+                return self.eigfun(L,store = False)
+            max_workers = min(len(manifold_pairs),os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for key, (e, r, l) in zip(manifold_pairs,executor.map(f,Ls)):
+                    self.store_eigensystem_by_manifold(key,e,r,l)
+            # The workers do not write to self; the last coherence is
+            # recorded here, as the sequential loop did
+            self.eigenvalues = e
+            self.eigenvectors = {'left':l,'right':r}
+
+    def store_eigensystem_by_manifold(self,key,e,r,l):
+        # The saved archives and the reshapes in make_mu_by_manifold_* need
+        # dense eigenvectors, so sparse ones from eigfun2 are densified here
+        if issparse(r):
+            r = r.toarray()
+        self.right_eigenvectors_by_manifold[key] = r
+        # l only ever multiplies from the left, in l.dot(...)
+        if issparse(l):
+            self.left_eigenvectors_by_manifold[key] = l.toarray(order='F')
+        else:
+            self.left_eigenvectors_by_manifold[key] = np.asfortranarray(l)
+        self.eigenvalues_by_manifold[key] = e
+
+    @staticmethod
+    def real_if_negligible_imag(O,*,atol=1E-8):
+        """Returns the real part of O if O is complex with every imaginary
+            part within atol of 0 (the np.allclose(np.imag(O),0) test).  If 
+            O has a real dtype, it is returned without being scanned.  The real
+            part is returned as a contiguous copy, so that it does not keep 
+            the complex buffer alive
+"""
+        if not np.iscomplexobj(O):
+            return O
+        if np.abs(O.imag).max(initial=0) <= atol:
+            return np.ascontiguousarray(O.real)
+        return O
 
     def make_mu_by_manifold_ket(self,old_manifold,change,*,H_eigentransform=False,L_eigentransform=True):
         i,j = old_manifold
@@ -1294,31 +1908,34 @@ gamma)"""
         else:
             pass
         j2 = j
-        bra_eye = np.eye(self.extract_vibronic_manifold(self.total_hamiltonian,j).shape[0])
-        old_key = str(i) + str(j)
-        new_key = str(i2) + str(j2)
-        all_mus = []
-        mu_dtype='float64'
-        for pol in self.pols:
-            full_mu = self.vibronic_mu_dict[pol]
-            mu = self.extract_vibronic_coherence(full_mu,i2,i)
-            if H_eigentransform:
-                mu = Vnew.T.dot(mu.dot(Vold))
-            mu = np.kron(mu,bra_eye)
+        bra_size = self.vibronic_manifold_mask(j).size
+        old_key = (i,j)
+        new_key = (i2,j2)
+        # Stack the polarizations so that each transform is one batched matmul
+        mu_stack = np.stack([self.extract_vibronic_coherence(self.vibronic_mu_dict[pol],i2,i)
+                             for pol in self.pols])
+        mu_key = (old_key,new_key)
+        if not mu_stack.any():
+            # The manifolds are not dipole-coupled, so every transform is zero
             if L_eigentransform:
-                l = self.left_eigenvectors_by_manifold[new_key]
-                r = self.right_eigenvectors_by_manifold[old_key]
-                mu = l.dot(mu.dot(r))
-            if np.allclose(np.imag(mu),0):
-                mu = np.real(mu)
+                shape = (self.left_eigenvectors_by_manifold[new_key].shape[0],
+                         self.right_eigenvectors_by_manifold[old_key].shape[-1])
             else:
-                mu_dtype = 'complex128'
-            all_mus.append(mu)
-        mu_shape = all_mus[0].shape
-        mu_3d = np.zeros((mu_shape[0],mu_shape[1],3),dtype=mu_dtype)
-        for i in range(3):
-            mu_3d[:,:,i] = all_mus[i]
-        mu_key = old_key + '_to_' + new_key
+                shape = (mu_stack.shape[1]*bra_size,mu_stack.shape[2]*bra_size)
+            return mu_key, np.zeros(shape + (len(self.pols),))
+        if H_eigentransform:
+            mu_stack = np.matmul(Vnew.T,np.matmul(mu_stack,Vold))
+        if L_eigentransform:
+            l = self.left_eigenvectors_by_manifold[new_key]
+            r = self.right_eigenvectors_by_manifold[old_key]
+            num_cols = r.shape[-1]
+            r = r.reshape(mu_stack.shape[2],-1)
+            mu_stack = np.matmul(mu_stack,r).reshape(mu_stack.shape[0],-1,num_cols)
+            mu_stack = np.matmul(l,mu_stack)
+        else:
+            mu_stack = np.stack([self.kron_with_identity(mu,bra_size) for mu in mu_stack])
+        mu_stack = self.real_if_negligible_imag(mu_stack)
+        mu_3d = np.moveaxis(mu_stack,0,-1)
         return mu_key, mu_3d
 
     def make_mu_by_manifold_bra(self,old_manifold,change,*,H_eigentransform=False,L_eigentransform=True):
@@ -1334,102 +1951,164 @@ gamma)"""
         else:
             pass
         i2 = i
-        ket_eye = np.eye(self.extract_vibronic_manifold(self.total_hamiltonian,i).shape[0])
-        old_key = str(i) + str(j)
-        new_key = str(i2) + str(j2)
-        all_mus = []
-        mu_dtype='float64'
-        for pol in self.pols:
-            full_mu = self.vibronic_mu_dict[pol]
-            mu = self.extract_vibronic_coherence(full_mu,j,j2)
-            if H_eigentransform:
-                mu = Vold.T.dot(mu.dot(Vnew))
-            mu = np.kron(ket_eye,mu.T)
+        ket_size = self.vibronic_manifold_mask(i).size
+        old_key = (i,j)
+        new_key = (i2,j2)
+        # Stack the polarizations so that each transform is one batched matmul
+        mu_stack = np.stack([self.extract_vibronic_coherence(self.vibronic_mu_dict[pol],j,j2)
+                             for pol in self.pols])
+        mu_key = (old_key,new_key)
+        if not mu_stack.any():
+            # The manifolds are not dipole-coupled, so every transform is zero
             if L_eigentransform:
-                l = self.left_eigenvectors_by_manifold[new_key]
-                r = self.right_eigenvectors_by_manifold[old_key]
-                mu = l.dot(mu.dot(r))
-            if np.allclose(np.imag(mu),0):
-                mu = np.real(mu)
+                shape = (self.left_eigenvectors_by_manifold[new_key].shape[0],
+                         self.right_eigenvectors_by_manifold[old_key].shape[-1])
             else:
-                mu_dtype = 'complex128'
-            all_mus.append(mu)
-        mu_shape = all_mus[0].shape
-        mu_3d = np.zeros((mu_shape[0],mu_shape[1],3),dtype=mu_dtype)
-        for i in range(3):
-            mu_3d[:,:,i] = all_mus[i]
-        mu_key = old_key + '_to_' + new_key
+                shape = (ket_size*mu_stack.shape[2],ket_size*mu_stack.shape[1])
+            return mu_key, np.zeros(shape + (len(self.pols),))
+        if H_eigentransform:
+            mu_stack = np.matmul(Vold.T,np.matmul(mu_stack,Vnew))
+        mu_T_stack = np.transpose(mu_stack,(0,2,1))
+        if L_eigentransform:
+            l = self.left_eigenvectors_by_manifold[new_key]
+            r = self.right_eigenvectors_by_manifold[old_key]
+            num_cols = r.shape[-1]
+            r = r.reshape(ket_size,mu_stack.shape[1],num_cols)
+            mu_stack = np.matmul(mu_T_stack[:,np.newaxis,:,:],r)
+            mu_stack = mu_stack.reshape(mu_T_stack.shape[0],-1,num_cols)
+            mu_stack = np.matmul(l,mu_stack)
+        else:
+            mu_stack = np.stack([self.kron_with_identity(mu_T,ket_size,identity_first=True)
+                                 for mu_T in mu_T_stack])
+        mu_stack = self.real_if_negligible_imag(mu_stack)
+        mu_3d = np.moveaxis(mu_stack,0,-1)
         return mu_key, mu_3d
 
-    def append_mu_by_manifold(self,old_manifold,change,ket_flag,H_eigentransform=False,
-                              L_eigentransform=True):
+    def make_pruned_mu_by_manifold(self,old_manifold,change,ket_flag,H_eigentransform=False,
+                                   L_eigentransform=True):
+        """Returns (key, mu, boolean_mu) for one dipole transition, with the
+            negligible elements of mu zeroed.  Returns (None, None, None) if
+            the new manifold is out of range.  Does not modify self
+"""
         if ket_flag:
             f = self.make_mu_by_manifold_ket
         else:
             f = self.make_mu_by_manifold_bra
         key, mu = f(old_manifold,change,H_eigentransform=H_eigentransform,
                     L_eigentransform=L_eigentransform)
+        if key == None:
+            return None, None, None
+        # Sum of squares over polarizations, reading the real and
+        # imaginary parts as views to avoid (n,n,3) temporaries
+        mu_sq = np.einsum('ijk,ijk->ij',mu.real,mu.real)
+        if np.iscomplexobj(mu):
+            mu_sq += np.einsum('ijk,ijk->ij',mu.imag,mu.imag)
+        boolean_mu = mu_sq > 0.5*10**-12
+        mu *= boolean_mu[:,:,np.newaxis]
+        return key, mu, boolean_mu
+
+    def append_mu_by_manifold(self,old_manifold,change,ket_flag,H_eigentransform=False,
+                              L_eigentransform=True):
+        key, mu, boolean_mu = self.make_pruned_mu_by_manifold(old_manifold,change,ket_flag,
+                                                              H_eigentransform=H_eigentransform,
+                                                              L_eigentransform=L_eigentransform)
         if key == None:
             pass
         else:
-            boolean_mu = np.zeros(mu.shape[:2],dtype='bool')
-            boolean_mu[:,:] = np.round(np.sum(np.abs(mu)**2,axis=-1),12)
-            mu = mu * boolean_mu[:,:,np.newaxis]
             self.boolean_mu_by_manifold[key] = boolean_mu
             self.mu_by_manifold[key] = mu
 
     def set_mu_by_manifold(self,H_eigentransform=False,L_eigentransform=True):
         self.mu_by_manifold = dict()
         self.boolean_mu_by_manifold = dict()
-        changes = [-1,1]
+        args = [((i,j),change,ket_flag) for i in range(self.maximum_manifold+1)
+                for j in range(self.maximum_manifold+1)
+                for ket_flag in [True,False] for change in [1,-1]]
+        # Fill the lazy manifold index caches before the threads read them
         for i in range(self.maximum_manifold+1):
-            for j in range(self.maximum_manifold+1):
-                manifold = (i,j)
-                self.append_mu_by_manifold(manifold,1,True,H_eigentransform=H_eigentransform,L_eigentransform=L_eigentransform)
-                self.append_mu_by_manifold(manifold,-1,True,H_eigentransform=H_eigentransform,L_eigentransform=L_eigentransform)
-                self.append_mu_by_manifold(manifold,1,False,H_eigentransform=H_eigentransform,L_eigentransform=L_eigentransform)
-                self.append_mu_by_manifold(manifold,-1,False,H_eigentransform=H_eigentransform,L_eigentransform=L_eigentransform)
+            self.vibronic_manifold_slice(i)
+        def f(arg):
+            return self.make_pruned_mu_by_manifold(*arg,H_eigentransform=H_eigentransform,
+                                                   L_eigentransform=L_eigentransform)
+        # The transitions are independent, and the matmuls release the GIL,
+        # so they are run on a thread pool
+        max_workers = min(len(args),os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(f,args))
+        for key, mu, boolean_mu in results:
+            if key is not None:
+                self.boolean_mu_by_manifold[key] = boolean_mu
+                self.mu_by_manifold[key] = mu
                 
     def save_mu_by_manifold(self,*,pruned=True):
+        # The pruned dipoles are mostly zeros, and the boolean masks compress
+        # very well, so both are compressed.  np.load reads them unchanged
         if pruned:
-            np.savez(os.path.join(self.base_path,'mu_pruned.npz'),**self.mu_by_manifold)
-            np.savez(os.path.join(self.base_path,'mu_boolean.npz'),**self.boolean_mu_by_manifold)
+            np.savez_compressed(os.path.join(self.base_path,'mu_pruned.npz'),
+                                **self.manifold_dict_to_str_keys(self.mu_by_manifold))
+            np.savez_compressed(os.path.join(self.base_path,'mu_boolean.npz'),
+                                **self.manifold_dict_to_str_keys(self.boolean_mu_by_manifold))
         else:
-            np.savez(os.path.join(self.base_path,'mu.npz'),**self.mu_by_manifold)
+            np.savez(os.path.join(self.base_path,'mu.npz'),**self.manifold_dict_to_str_keys(self.mu_by_manifold))
 
     def save_eigensystem_by_manifold(self):
-        np.savez(os.path.join(self.base_path,'eigenvalues.npz'),**self.eigenvalues_by_manifold)
-        np.savez(os.path.join(self.base_path,'right_eigenvectors.npz'),**self.right_eigenvectors_by_manifold)
-        np.savez(os.path.join(self.base_path,'left_eigenvectors.npz'),**self.left_eigenvectors_by_manifold)
+        np.savez(os.path.join(self.base_path,'eigenvalues.npz'),
+                 **self.manifold_dict_to_str_keys(self.eigenvalues_by_manifold))
+        np.savez(os.path.join(self.base_path,'right_eigenvectors.npz'),
+                 **self.manifold_dict_to_str_keys(self.right_eigenvectors_by_manifold))
+        np.savez(os.path.join(self.base_path,'left_eigenvectors.npz'),
+                 **self.manifold_dict_to_str_keys(self.left_eigenvectors_by_manifold))
                 
-    def extract_coherence_instructions_from_full_instructions(self,inst_list,manifold1,manifold2,*,H_eigentransform=False,trim = None):
-        new_inst_list = []
-        H1 = self.extract_vibronic_manifold(self.total_hamiltonian,manifold1)
-        H2 = self.extract_vibronic_manifold(self.total_hamiltonian,manifold2)
+    def transform_manifold_operator(self,O,manifold_num,*,H_eigentransform=False,transform_cache=None):
+        """Projects operator O into the given manifold, and optionally into
+            the eigenbasis of H within that manifold.  If transform_cache is
+            a dict, results are stored in it keyed by (id(O), manifold_num),
+            so it must not outlive the operators it was filled from
+"""
+        key = (id(O),manifold_num)
+        try:
+            return transform_cache[key]
+        except (KeyError,TypeError):
+            pass
+        new_O = self.extract_vibronic_manifold(O,manifold_num)
         if H_eigentransform:
-            V1 = self.H_eigenvectors[manifold1]
-            V2 = self.H_eigenvectors[manifold2]
-        else:
-            V1 = np.eye(H1.shape[0])
-            V2 = np.eye(H2.shape[0])
+            V = self.H_eigenvectors[manifold_num]
+            new_O = V.T.dot(new_O.dot(V))
+        if transform_cache is not None:
+            transform_cache[key] = new_O
+        return new_O
+
+    def extract_coherence_instructions_from_full_instructions(self,inst_list,manifold1,manifold2,*,H_eigentransform=False,trim = None,transform_cache=None):
+        """The same operators appear in many instructions and in every 
+            coherence, so their transforms are memoized in transform_cache
+            (see transform_manifold_operator)
+"""
+        if transform_cache is None:
+            transform_cache = dict()
+        new_inst_list = []
         for (left,right) in inst_list:
-            new_left = self.extract_vibronic_manifold(left,manifold1)
-            new_left = V1.T.dot(new_left.dot(V1))
-            new_right = self.extract_vibronic_manifold(right,manifold2)
-            new_right = V2.T.dot(new_right.dot(V2))
-            new_inst_list.append((new_left[:trim,:trim],new_right[:trim,:trim]))
+            new_left = self.transform_manifold_operator(left,manifold1,H_eigentransform=H_eigentransform,
+                                                        transform_cache=transform_cache)
+            new_right = self.transform_manifold_operator(right,manifold2,H_eigentransform=H_eigentransform,
+                                                         transform_cache=transform_cache)
+            if trim is not None:
+                new_left = new_left[:trim,:trim]
+                new_right = new_right[:trim,:trim]
+            # Untrimmed, the cached operators are reused as they are, so 
+            # instructions sharing an operator can be merged by make_Liouvillian
+            new_inst_list.append((new_left,new_right))
         return new_inst_list
 
     def extract_manifold_instructions_from_full_instructions(self,inst_list,manifold):
         return self.extract_coherence_instructions_from_full_instructions(inst_list,manifold,manifold)
     
     def add_vibrations(self):
-        v0 = self.empty_vibrations
-        v1 = self.occupied_vibrations
-        self.vibrational_hamiltonian = np.zeros(self.total_hamiltonian.shape)
-        for i in range(len(v0)):
-            self.vibrational_hamiltonian += v0[i]
-            self.vibrational_hamiltonian += v1[i]
+        terms = self.empty_vibrations + self.occupied_vibrations
+        # Accumulated in place, starting from the first sum, rather than 
+        # stacking the terms, which would copy every one of them
+        self.vibrational_hamiltonian = np.add(terms[0],terms[1])
+        for O in terms[2:]:
+            self.vibrational_hamiltonian += O
 
         self.total_hamiltonian = self.total_hamiltonian + self.vibrational_hamiltonian
 
@@ -1451,6 +2130,8 @@ gamma)"""
             nv = self.num_vibrations
             self.vibrational_mask = (np.arange(N**nv),)
             self.vibrational_identity = np.eye(N**nv)
+        self.vibronic_manifold_indices = dict()
+        self.vibronic_manifold_slices = dict()
         empty_vibrations = self.kron_up_vibrations(emp_vibs)
         occupied_vibrations = self.kron_up_vibrations(occ_vibs)
 
@@ -1459,15 +2140,34 @@ gamma)"""
         
         for i in range(self.num_vibrations):
             site_index = vibration_params[i]['site_label']
-            if self.manifolds_separable == True:
-                empty = self.empty_list[site_index]
-                occupied = self.occupied_list[site_index]
-            else:
-                empty = self.extract_electronic_subspace(self.empty_list[site_index],0,self.maximum_manifold)
-                occupied = self.extract_electronic_subspace(self.occupied_list[site_index],0,self.maximum_manifold)
+            empty, occupied = self.site_occupation_projectors(site_index)
             self.empty_vibrations.append(np.kron(empty,empty_vibrations[i]))
             self.occupied_vibrations.append(np.kron(occupied,occupied_vibrations[i]))
 
+    def site_occupation_projectors(self,site_index):
+        """Returns the (empty, occupied) operators of the given site, projected
+            onto manifolds 0 through maximum_manifold when the manifolds are
+            not separable.  Only these operators are built as dense matrices,
+            from the diagonals in empty_diagonal_list and occupied_diagonal_list.
+            Many modes may share a site, so results are cached by site_index
+"""
+        try:
+            return self.site_occupation_projector_cache[site_index]
+        except AttributeError:
+            self.site_occupation_projector_cache = dict()
+        except KeyError:
+            pass
+        empty = self.empty_diagonal_list[site_index]
+        occupied = self.occupied_diagonal_list[site_index]
+        if self.manifolds_separable == False:
+            inds = self.electronic_subspace_mask(0,self.maximum_manifold)
+            empty = empty[inds]
+            occupied = occupied[inds]
+        empty = np.diag(empty)
+        occupied = np.diag(occupied)
+        self.site_occupation_projector_cache[site_index] = (empty,occupied)
+        return empty, occupied
+
     def kron_up_vibrations(self,vibrations_list):
         n = self.num_vibrations
         if n == 1:
@@ -1482,32 +2182,28 @@ gamma)"""
             
     def mask_vibrational_space(self,O):
         inds = self.vibrational_mask
+        ix = np.ix_(inds[0],inds[0])
         if type(O) is np.ndarray:
-            O = O[inds[0],:].copy()
-            O = O[:,inds[0]].copy()
-            return O
+            return O[ix]
         
         if type(O) is csr_matrix:
             pass
         else:
             O = O.tocsr()
-        O = O[inds[0]]
-        O = O.transpose()
-        O = O[inds[0]]
-        O = O.transpose()
-        return O
+        return O[ix]
 
     def vibration_identity_kron(self,position,item):
         """Takes in a single vibrational hamiltonians and krons it with the correct 
             number of vibrational identities, inserting it into its position as indexed by its mode
             position as specified in the input file"""
-        identities = [np.eye(self.truncation_size) for n in
-                      range(self.num_vibrations-1)]
-        identities.insert(position,item)
-        mat = identities.pop(0)
-        for next_item in identities:
-            mat = np.kron(mat,next_item)
-        return mat
+        N = self.truncation_size
+        left_size = N**position
+        right_size = N**(self.num_vibrations-position-1)
+        # The identities on either side of item are merged into one identity
+        # each, and the Kronecker product is formed in a single contraction
+        mat = np.einsum('ab,ij,cd->aicbjd',np.eye(left_size),item,np.eye(right_size))
+        size = left_size * item.shape[0] * right_size
+        return mat.reshape(size,size)
 
     def vibrational_vector_of_ones_kron(self,position,item):
         """Takes in a single vibrational hamiltonians and krons it with the correct 
@@ -1515,20 +2211,17 @@ gamma)"""
             position as specified in the input file"""
         N = self.truncation_size
         nv = self.num_vibrations
-        ones_list = [np.ones(N) for i in range(nv-1)]
-        ones_list.insert(position,item)
-        vec = ones_list.pop(0)
-        for next_item in ones_list:
-            vec = np.kron(vec,next_item)
-        return vec
+        vec = np.einsum('a,i,c->aic',np.ones(N**position),item,np.ones(N**(nv-position-1)))
+        return vec.ravel()
 
     def set_vibrational_total_occupation_number(self):
         N = self.truncation_size
         nv = self.num_vibrations
-        single_mode_occ = np.arange(N)
-        occ_num = self.vibrational_vector_of_ones_kron(0,single_mode_occ)
-        for i in range(1,nv):
-            occ_num += self.vibrational_vector_of_ones_kron(i,single_mode_occ)
+        # Sum the single-mode occupations by broadcasting over one axis per mode
+        occ_num = np.zeros([N]*nv,dtype='int')
+        for i in range(nv):
+            occ_num += np.arange(N).reshape([1]*i + [N] + [1]*(nv-1-i))
+        occ_num = occ_num.ravel()
         self.vibrational_total_occupation_number = occ_num
         self.vibrational_mask = np.where(occ_num < N)
         self.vibrational_identity = np.eye(self.vibrational_mask[0].size)
@@ -1547,11 +2240,13 @@ gamma)"""
 
     def construct_vibrational_ladder_operator(self,single_mode,electronic_occupation):
         """Construct ladder operator given the electronic occupation for that site"""
-        w = single_mode['omega_g']
         d  = single_mode['displacement'][electronic_occupation]
-        aho = AnharmonicDisplaced(self.truncation_size)
-        aho.calculation_size = self.truncation_size
-        up = aho.create() - np.eye(self.truncation_size) * d/np.sqrt(2)
+        N = self.truncation_size
+        shift = -d/np.sqrt(2)
+        up = np.zeros((N,N),dtype=np.result_type(float,shift))
+        n = np.arange(N-1)
+        up[n+1,n] = np.sqrt(n+1)
+        np.fill_diagonal(up,shift)
         return up
 
     def set_vibrational_ladder_operators(self):
@@ -1572,12 +2267,7 @@ gamma)"""
         self.occupied_ups = []
         for i in range(self.num_vibrations):
             site_index = vibration_params[i]['site_label']
-            if self.manifolds_separable == True:
-                empty = self.empty_list[site_index]
-                occupied = self.occupied_list[site_index]
-            else:
-                empty = self.extract_electronic_subspace(self.empty_list[site_index],0,self.maximum_manifold)
-                occupied = self.extract_electronic_subspace(self.occupied_list[site_index],0,self.maximum_manifold)
+            empty, occupied = self.site_occupation_projectors(site_index)
             self.empty_ups.append(np.kron(empty,empty_ups[i]))
             self.occupied_ups.append(np.kron(occupied,occupied_ups[i]))
 
@@ -1610,8 +2300,25 @@ gamma)"""
 
     def make_total_Liouvillian(self):
         ins = self.make_commutator_instructions(-1j*self.total_hamiltonian)
+        ins += self.vibrational_dissipation_instructions()
         self.L = self.make_Liouvillian(ins)
-        self.L += self.make_vibrational_dissipation_Liouvillian()
+
+    @staticmethod
+    def kron_with_identity(A,size,*,identity_first=False):
+        """Returns np.kron(A,np.eye(size)), or np.kron(np.eye(size),A) if 
+            identity_first is True.  Only the n*m*size entries that can be 
+            nonzero are written, instead of multiplying every entry of A by a
+            full identity
+"""
+        n, m = A.shape
+        idx = np.arange(size)
+        if identity_first:
+            out = np.zeros((size,n,size,m),dtype=A.dtype)
+            out[idx,:,idx,:] = A[np.newaxis,:,:]
+        else:
+            out = np.zeros((n,size,m,size),dtype=A.dtype)
+            out[:,idx,:,idx] = A[np.newaxis,:,:]
+        return out.reshape(n*size,m*size)
 
     def make_condon_mu(self):
         try:
@@ -1620,8 +2327,8 @@ gamma)"""
             N = self.truncation_size
             nv = self.num_vibrations
             vib_size = N**nv
-        self.mu = np.kron(self.mu,np.eye(vib_size))
-        self.mu_ket_up = np.kron(self.mu_ket_up,np.eye(vib_size))
+        self.mu = self.kron_with_identity(self.mu,vib_size)
+        self.mu_ket_up = self.kron_with_identity(self.mu_ket_up,vib_size)
 
     def make_condon_mu_dict(self):
         try:
@@ -1632,5 +2339,5 @@ gamma)"""
             vib_size = N**nv
         self.vibronic_mu_dict = dict()
         for pol in self.pols:
-            self.vibronic_mu_dict[pol] =  np.kron(self.mu_dict[pol],np.eye(vib_size))
+            self.vibronic_mu_dict[pol] = self.kron_with_identity(self.mu_dict[pol],vib_size)
             
@@ -522,11 +522,8 @@ the eigenvalues (since they are not expected to be orthogonal).
                 # warnings.warn('Eigenvalues altered by QR factorization, max absolute change in diagonal matrix of {}'.format(np.max(D-np.diag(eigvals))))
                 warnings.warn('Using eigenvectors to diagonalize hamiltonian does not result in the expected diagonal matrix to tolerance, largest deviation is {}'.format(np.max(np.abs(D - np.diag(eigvals)))))
         
-        sort_indices = eigvals.argsort()
-        eigvals.sort()
-        eigvecs = eigvecs[:,sort_indices]
+        # eigh returns the eigenvalues in ascending order, so no sorting is needed
         if self.qr_flag:
-            r = r[:,sort_indices]
             self.r_mats.append(r)
         # I choose to pick the phase of my eigenvectors such that the state which has the
         # largest overlap has a positive overlap. For sufficiently small d, and alpha close